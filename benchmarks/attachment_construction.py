@@ -0,0 +1,69 @@
+"""
+Compare the cost of building attachments through pydantic validation,
+the trusted construction path and the slotted record type.
+
+Usage:
+    python benchmarks/attachment_construction.py [--count 10000] [--repeat 5]
+"""
+
+import argparse
+import timeit
+from typing import Any, Callable
+
+from licitpy.core.enums import Attachment, AttachmentRecord, FileType
+
+
+def build_rows(count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": str(index),
+            "name": f"Bases_{index}.pdf",
+            "type": "Anexo",
+            "description": "Bases administrativas",
+            "size": 1024 * (index % 500 + 1),
+            "upload_date": "06-08-2024",
+            "file_type": FileType.PDF,
+        }
+        for index in range(count)
+    ]
+
+
+def validated(rows: list[dict[str, Any]]) -> list[Attachment]:
+    return [Attachment(**row) for row in rows]
+
+
+def trusted(rows: list[dict[str, Any]]) -> list[Attachment]:
+    return [Attachment.from_trusted(**row) for row in rows]
+
+
+def records(rows: list[dict[str, Any]]) -> list[AttachmentRecord]:
+    return [AttachmentRecord(**row) for row in rows]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = build_rows(args.count)
+
+    candidates: dict[str, Callable[[list[dict[str, Any]]], list[Any]]] = {
+        "Attachment(**row)": validated,
+        "Attachment.from_trusted": trusted,
+        "AttachmentRecord": records,
+    }
+
+    baseline: float | None = None
+
+    print(f"Building {args.count:,} attachments (best of {args.repeat})")
+
+    for label, fn in candidates.items():
+        best = min(timeit.repeat(lambda: fn(rows), number=1, repeat=args.repeat))
+        baseline = baseline or best
+
+        print(f"{label:<26} {best * 1000:9.2f} ms  {baseline / best:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Compare licitpy.core.dates against the previous date parsing code.
+
+Chile dates ("dd-mm-YYYY HH:MM:SS") are parsed over the full corpus.
+`dateparser` is far slower, so the EU "YYYY-MM" strings are timed on a
+sample and extrapolated to the corpus size.
+
+Usage:
+    python benchmarks/date_parsing.py [--count 100000] [--dateparser-sample 5000]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime
+from typing import Any, Callable
+from zoneinfo import ZoneInfo
+
+from licitpy.core.dates import parse_date, parse_day_month_year_time
+
+
+def build_chile_corpus(count: int) -> list[str]:
+    rng = random.Random(0)
+
+    return [
+        f"{rng.randint(1, 28):02d}-{rng.randint(1, 12):02d}-{rng.randint(2015, 2025)} "
+        f"{rng.randint(0, 23)}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}"
+        for _ in range(count)
+    ]
+
+
+def build_month_corpus(count: int) -> list[str]:
+    rng = random.Random(0)
+
+    return [f"{rng.randint(2015, 2025)}-{rng.randint(1, 12)}" for _ in range(count)]
+
+
+def strptime_zoneinfo(value: str) -> datetime:
+    return datetime.strptime(value, "%d-%m-%Y %H:%M:%S").replace(
+        tzinfo=ZoneInfo("America/Santiago")
+    )
+
+
+def dateparser_parse(value: str) -> Any:
+    import dateparser
+
+    return dateparser.parse(value)
+
+
+def timed(fn: Callable[[str], Any], corpus: list[str]) -> float:
+    start = time.perf_counter()
+
+    for value in corpus:
+        fn(value)
+
+    return time.perf_counter() - start
+
+
+def report(label: str, seconds: float, count: int, baseline: float) -> None:
+    print(
+        f"{label:<34} {seconds:8.3f} s  {count / seconds:12,.0f} dates/s  "
+        f"{baseline / seconds:7.1f}x"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--dateparser-sample", type=int, default=5_000)
+    args = parser.parse_args()
+
+    chile = build_chile_corpus(args.count)
+    months = build_month_corpus(args.count)
+
+    # Warm up imports and caches so they are not part of the timings
+    dateparser_parse(months[0])
+    parse_date(months[0])
+
+    print(f"Chile dates, {args.count:,} values")
+    before = timed(strptime_zoneinfo, chile)
+    after = timed(parse_day_month_year_time, chile)
+    report("strptime + ZoneInfo", before, args.count, before)
+    report("parse_day_month_year_time", after, args.count, before)
+
+    sample = months[: args.dateparser_sample]
+    scale = args.count / len(sample)
+
+    print(f"\nEU YYYY-MM, {args.count:,} values (dateparser extrapolated)")
+    before = timed(dateparser_parse, sample) * scale
+    after = timed(parse_date, months)
+    report("dateparser.parse", before, args.count, before)
+    report("parse_date", after, args.count, before)
+
+
+if __name__ == "__main__":
+    main()
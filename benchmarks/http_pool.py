@@ -0,0 +1,141 @@
+"""
+Requests/sec of the tuned AsyncHttpClient session against the previous
+default session, using a local aiohttp server that serves a tender-sized
+HTML page. The server emulates per-connection bandwidth and serves a
+gzip body when the client negotiates it, like the real portals do.
+
+Usage:
+    python benchmarks/http_pool.py [--requests 2000] [--concurrency 50] \
+        [--delay 0.005] [--bandwidth 2000000]
+"""
+
+import argparse
+import asyncio
+import gzip
+import multiprocessing
+import time
+from typing import Awaitable, Callable
+
+from aiohttp import ClientSession, web
+
+from licitpy.core.http import AsyncHttpClient
+
+# Headers sent by AsyncHttpClient before connector settings were configurable
+PREVIOUS_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en,es-ES;q=0.9,es;q=0.8",
+    "Connection": "keep-alive",
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64)",
+}
+
+PAGE = ("<tr><td>Bases administrativas</td><td>1024 Kb</td></tr>" * 1500).encode()
+PAGE_GZIP = gzip.compress(PAGE)
+
+CHUNK_SIZE = 16 * 1024
+
+
+def serve(port: int, delay: float, bandwidth: int) -> None:
+    """Run the server in its own process so it does not share the client's CPU."""
+
+    async def handler(request: web.Request) -> web.StreamResponse:
+        if delay:
+            await asyncio.sleep(delay)
+
+        body = PAGE
+        response = web.StreamResponse(headers={"Content-Type": "text/html"})
+
+        if "gzip" in request.headers.get("Accept-Encoding", ""):
+            body = PAGE_GZIP
+            response.headers["Content-Encoding"] = "gzip"
+
+        response.content_length = len(body)
+        await response.prepare(request)
+
+        for offset in range(0, len(body), CHUNK_SIZE):
+            chunk = body[offset : offset + CHUNK_SIZE]
+            await response.write(chunk)
+
+            if bandwidth:
+                await asyncio.sleep(len(chunk) / bandwidth)
+
+        await response.write_eof()
+
+        return response
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+
+    web.run_app(app, host="127.0.0.1", port=port, print=None)
+
+
+async def measure(
+    fetch: Callable[[], Awaitable[object]], requests: int, concurrency: int
+) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded() -> None:
+        async with semaphore:
+            await fetch()
+
+    start = time.perf_counter()
+    await asyncio.gather(*[bounded() for _ in range(requests)])
+
+    return requests / (time.perf_counter() - start)
+
+
+async def main(args: argparse.Namespace) -> None:
+    url = f"http://127.0.0.1:{args.port}/"
+
+    server = multiprocessing.Process(
+        target=serve, args=(args.port, args.delay, args.bandwidth), daemon=True
+    )
+    server.start()
+
+    # Wait until the server accepts connections
+    async with ClientSession() as session:
+        for _ in range(100):
+            try:
+                async with session.get(url) as response:
+                    await response.read()
+                break
+            except OSError:
+                await asyncio.sleep(0.05)
+
+    try:
+        async with ClientSession(headers=PREVIOUS_HEADERS) as session:
+
+            async def previous() -> str:
+                async with session.get(url) as response:
+                    return await response.text()
+
+            before = await measure(previous, args.requests, args.concurrency)
+
+        client = AsyncHttpClient(use_cache=False)
+        await client.open()
+
+        try:
+            after = await measure(
+                lambda: client.get_html_by_url(url), args.requests, args.concurrency
+            )
+        finally:
+            await client.close()
+    finally:
+        server.terminate()
+        server.join()
+
+    print(f"{args.requests:,} requests, concurrency {args.concurrency}")
+    print(f"previous session   {before:10.1f} req/s")
+    print(f"AsyncHttpClient    {after:10.1f} req/s  {after / before:5.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.005, help="Server delay (s)")
+    parser.add_argument(
+        "--bandwidth", type=int, default=2_000_000, help="Bytes/s per connection"
+    )
+    parser.add_argument("--port", type=int, default=8799)
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,89 @@
+"""
+Import-time regression check for `import licitpy`.
+
+Runs the import in fresh interpreters, keeps the best cumulative time reported
+by `python -X importtime` and exits with status 1 when it exceeds the budget
+or when a heavy dependency is imported eagerly.
+
+Usage:
+    python benchmarks/import_time.py [--budget-ms 150] [--runs 5]
+"""
+
+import argparse
+import subprocess
+import sys
+
+# Dependencies that must only be imported on first use
+LAZY_MODULES = [
+    "aiohttp",
+    "aiohttp_client_cache",
+    "dateparser",
+    "tqdm",
+    "pydantic",
+    "lxml",
+    "asyncio",
+    "licitpy.countries.cl.provider",
+    "licitpy.countries.eu.provider",
+]
+
+
+def measure_import_us(module: str) -> int:
+    """Cumulative import time of `module` in microseconds, in a fresh interpreter."""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    for line in reversed(result.stderr.splitlines()):
+        # import time: self [us] | cumulative | imported package
+        _, cumulative, name = line.split("|")
+
+        if name.strip() == module:
+            return int(cumulative)
+
+    raise RuntimeError(f"Could not find '{module}' in -X importtime output")
+
+
+def eagerly_imported(module: str) -> list[str]:
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    return [name for name in result.stdout.strip().split(",") if name]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="licitpy")
+    parser.add_argument("--budget-ms", type=float, default=150.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    best_ms = min(measure_import_us(args.module) for _ in range(args.runs)) / 1000
+    eager = eagerly_imported(args.module)
+
+    print(f"import {args.module}: {best_ms:.1f} ms (budget {args.budget_ms:.1f} ms)")
+
+    failed = False
+
+    if best_ms > args.budget_ms:
+        print("FAIL: import time is over budget")
+        failed = True
+
+    if eager:
+        print(f"FAIL: imported eagerly: {', '.join(eager)}")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Offline end-to-end throughput benchmark built on record/replay fixtures.
+
+Record a fixture archive once against the real portals:
+
+    python benchmarks/offline_e2e.py record fixtures/bench --codes codes.txt --eu-month 2023-10
+
+Then replay it as often as needed, without network access:
+
+    python benchmarks/offline_e2e.py run fixtures/bench --codes codes.txt \\
+        --batch-size 50 --latency 0.05 --bandwidth 5000000 --eu-month 2023-10
+
+Reports tenders/sec, attachments/sec, EU MB/sec and peak RSS.
+"""
+
+import argparse
+import asyncio
+import resource
+import sys
+import time
+from pathlib import Path
+
+from licitpy.core.fixtures import HttpFixtures
+from licitpy.core.models import Tender
+from licitpy.licitpy import Licitpy
+
+
+def read_codes(path: str) -> list[str]:
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip()]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def fetch_batch(
+    client: Licitpy, codes: list[str], download_attachments: bool
+) -> tuple[int, int]:
+    tenders: list[Tender] = await asyncio.gather(
+        *[client.cl.get_by_code(code) for code in codes]
+    )
+
+    attachments = 0
+
+    if download_attachments:
+        contents = await asyncio.gather(
+            *[
+                attachment.content
+                for tender in tenders
+                for attachment in tender.attachments
+            ]
+        )
+        attachments = len(contents)
+
+    return len(tenders), attachments
+
+
+async def run(args: argparse.Namespace, fixtures: HttpFixtures) -> None:
+    codes = read_codes(args.codes) if args.codes else []
+
+    async with Licitpy(use_cache=False, fixtures=fixtures) as client:
+        if codes:
+            tenders = attachments = 0
+            start = time.perf_counter()
+
+            for offset in range(0, len(codes), args.batch_size):
+                batch = codes[offset : offset + args.batch_size]
+                fetched, downloaded = await fetch_batch(
+                    client, batch, not args.skip_attachments
+                )
+
+                tenders += fetched
+                attachments += downloaded
+
+            elapsed = time.perf_counter() - start
+
+            print(f"tenders:      {tenders:>8}  {tenders / elapsed:10.2f} /s")
+            print(f"attachments:  {attachments:>8}  {attachments / elapsed:10.2f} /s")
+
+        for month in args.eu_month:
+            start = time.perf_counter()
+            result = await client.eu.download_monthly_bulk_file(month)
+            elapsed = time.perf_counter() - start
+
+            size = float(result["file_size"])
+            print(f"eu {month}:   {size:8.1f} MB  {size / elapsed:10.2f} MB/s")
+
+    print(f"peak RSS:     {peak_rss_mb():8.1f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("mode", choices=["record", "run"])
+    parser.add_argument("archive", help="Fixture archive directory")
+    parser.add_argument("--codes", help="File with one tender code per line")
+    parser.add_argument("--eu-month", action="append", default=[], help="YYYY-MM")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--skip-attachments", action="store_true")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--bandwidth", type=int, default=None, help="Bytes/second")
+    args = parser.parse_args()
+
+    if args.mode == "record":
+        fixtures = HttpFixtures.record(args.archive)
+    else:
+        fixtures = HttpFixtures.replay(
+            args.archive, latency=args.latency, bandwidth=args.bandwidth
+        )
+
+    asyncio.run(run(args, fixtures))
+
+
+if __name__ == "__main__":
+    main()
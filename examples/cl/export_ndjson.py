@@ -0,0 +1,34 @@
+import asyncio
+
+from licitpy.core.concurrency import iter_completed
+from licitpy.core.enums import Compression
+from licitpy.core.export import NDJSONWriter
+from licitpy.licitpy import Licitpy
+
+
+async def main() -> None:
+    async with Licitpy() as client:
+        tender_codes = [
+            "1057501-353-LE25",
+            "1057501-337-LE25",
+            "1057501-342-LE25",
+            "948806-66-LP25",
+        ]
+
+        tenders = iter_completed(
+            (client.cl.get_by_code(code) for code in tender_codes), concurrency=4
+        )
+
+        # Tenders are written as soon as each one is fetched
+        async with NDJSONWriter(
+            "output/tenders.ndjson",
+            compression=Compression.GZIP,
+            max_records=10_000,
+        ) as writer:
+            await writer.write_all(tenders)
+
+        print(f"Wrote {writer.records} tenders to {writer.files}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
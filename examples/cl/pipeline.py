@@ -0,0 +1,33 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from licitpy.core.export import NDJSONWriter
+from licitpy.licitpy import Licitpy
+
+
+async def main() -> None:
+    tender_codes = [
+        "1057501-353-LE25",
+        "1057501-337-LE25",
+        "1057501-342-LE25",
+        "948806-66-LP25",
+    ]
+
+    with ThreadPoolExecutor(max_workers=2) as parse_pool:
+        async with Licitpy() as client, NDJSONWriter("output/tenders.ndjson") as writer:
+            pipeline = client.cl.pipeline(
+                writer.write,
+                fetch_concurrency=4,
+                parse_executor=parse_pool,
+                queue_size=10,
+                on_error=lambda stage, code, e: print(f"{stage} failed: {e!r}"),
+            )
+
+            stats = await pipeline.run(tender_codes)
+
+    print(f"Wrote {stats.completed} tenders")
+    print(client.metrics.registry.gauges)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,23 @@
+from licitpy.sync import SyncLicitpy
+
+# One client per process, shared by every thread (eg: module level in a
+# Django app or a Celery worker). No asyncio needed by the caller.
+client = SyncLicitpy(timeout=60)
+
+
+def main() -> None:
+    tender = client.cl.get_by_code("1057501-353-LE25")
+    print(f"{tender.code}: {tender.title}")
+
+    tenders = client.cl.get_by_codes(
+        ["1057501-337-LE25", "1057501-342-LE25", "948806-66-LP25"], concurrency=3
+    )
+
+    for tender in tenders:
+        print(f"{tender.code}: {len(tender.attachments)} attachments")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
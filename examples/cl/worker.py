@@ -0,0 +1,37 @@
+import asyncio
+import sys
+
+from licitpy.core.models import Tender
+from licitpy.core.queue import SQLiteWorkQueue, WorkItem
+from licitpy.core.worker import CL_TENDER, CrawlWorker
+from licitpy.licitpy import Licitpy
+
+# Fill the queue once:   python worker.py enqueue codes.txt
+# Then start N workers:  python worker.py work  (in as many processes as needed)
+
+
+async def main() -> None:
+    queue = SQLiteWorkQueue("licitpy_queue.sqlite")
+
+    if sys.argv[1] == "enqueue":
+        with open(sys.argv[2], encoding="utf-8") as codes:
+            added = await queue.put(CL_TENDER, (code.strip() for code in codes))
+
+        print(f"Queued {added} tender codes")
+        return
+
+    async def save(item: WorkItem, tender: Tender) -> None:
+        print(f"{tender.code}: {tender.title}")
+
+    async with Licitpy() as client:
+        worker = CrawlWorker(client, queue, sink=save, concurrency=10)
+        stats = await worker.run()
+
+    totals = await worker.queue_stats()
+
+    print(f"This worker: {stats.processed} tenders, {stats.throughput:.2f}/s")
+    print(f"All workers: {totals.done} done, {totals.throughput:.2f}/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,29 @@
+from licitpy.countries.eu.parser import NoticeQuery
+from licitpy.sync import SyncLicitpy
+
+
+def main() -> None:
+    # Construction works (CPV 45) in Spain and Portugal, only the listed fields
+    query = NoticeQuery(
+        countries=["ES", "PT"],
+        cpv_prefixes=["45"],
+        fields=["notice_id", "publication_date", "country", "cpv"],
+    )
+
+    packages = [f"downloads/eu/2023-{month}.tar.gz" for month in range(1, 13)]
+
+    with SyncLicitpy() as client:
+        # One process per package, each notice dropped as soon as it does not match
+        notices = client.eu.iter_packages(
+            packages,
+            query,
+            max_workers=4,
+            on_error=lambda package, e: print(f"{package} failed: {e!r}"),
+        )
+
+        for notice in notices:
+            print(notice.notice_id, notice.country, notice.cpv)
+
+
+if __name__ == "__main__":
+    main()
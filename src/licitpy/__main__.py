@@ -0,0 +1,5 @@
+import sys
+
+from licitpy.cli import main
+
+sys.exit(main())
@@ -0,0 +1,448 @@
+"""
+Command-line entry point for bulk jobs.
+
+    licitpy tenders codes.txt -o tenders.ndjson.gz --concurrency 20
+    cat codes.txt | licitpy tenders - --format parquet -o tenders.parquet
+    licitpy attachments codes.txt --dir attachments
+    licitpy eu download 2024-01 2024-02 2023
+    licitpy eu ingest downloads/eu/2024-1.tar.gz -o notices.ndjson
+    licitpy eu ingest downloads/eu/2024-*.tar.gz --country ES --cpv 45 --workers 4
+
+Results are written as soon as each one completes. Failed items are logged
+to stderr and the exit status is 1 if any item failed.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Awaitable, Iterator, Sequence, TypeVar
+
+if TYPE_CHECKING:
+    from licitpy.core.export import RecordWriter
+    from licitpy.core.models import Tender
+    from licitpy.countries.eu.parser import NoticeQuery
+    from licitpy.licitpy import Licitpy
+
+logger = logging.getLogger("licitpy")
+
+T = TypeVar("T")
+
+CACHE_MODES = ("on", "off", "shared")
+FORMATS = ("ndjson", "parquet")
+
+
+def read_codes(source: str) -> Iterator[str]:
+    """Tender codes from a file, or stdin with "-". Blank lines and # comments are skipped."""
+
+    lines: IO[str] = sys.stdin if source == "-" else open(source, encoding="utf-8")
+
+    try:
+        for line in lines:
+            code = line.split("#", 1)[0].strip()
+
+            if code:
+                yield code
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+
+
+def create_client(args: argparse.Namespace) -> "Licitpy":
+    from licitpy.core.http import SharedCacheSettings
+    from licitpy.core.progress import NullProgressReporter
+    from licitpy.licitpy import Licitpy
+
+    return Licitpy(
+        use_cache=args.cache != "off",
+        # Several licitpy processes can run side by side on the same cache
+        shared_cache=SharedCacheSettings() if args.cache == "shared" else None,
+        rate_limit=args.rate_limit,
+        progress=NullProgressReporter() if args.no_progress else None,
+    )
+
+
+def create_writer(args: argparse.Namespace) -> "RecordWriter":
+    from licitpy.core.enums import Compression
+    from licitpy.core.export import NDJSONWriter, ParquetWriter, StreamWriter
+
+    output: str = args.output
+    output_format: str | None = args.format
+
+    if output_format is None:
+        output_format = "parquet" if output.endswith(".parquet") else "ndjson"
+
+    if output == "-":
+        if output_format != "ndjson":
+            raise SystemExit("licitpy: only NDJSON output can be written to stdout")
+
+        return StreamWriter()
+
+    if output_format == "parquet":
+        return ParquetWriter(output)
+
+    compression = Compression.NONE
+
+    if output.endswith(".gz"):
+        compression = Compression.GZIP
+    elif output.endswith(".zst"):
+        compression = Compression.ZSTD
+
+    return NDJSONWriter(output, compression=compression)
+
+
+async def _attempt(awaitable: Awaitable[T], item: str) -> T | None:
+    """Await `awaitable`, logging the failure and returning None if it fails."""
+
+    try:
+        return await awaitable
+    except Exception as e:
+        logger.error("%s failed: %r", item, e)
+        return None
+
+
+async def tenders(args: argparse.Namespace) -> int:
+    from licitpy.core.concurrency import iter_completed
+
+    failed = 0
+
+    async with create_client(args) as client, create_writer(args) as writer:
+        # Codes are read as slots free up, so long inputs stream through
+        results = iter_completed(
+            (
+                _attempt(client.cl.get_by_code(code), code)
+                for code in read_codes(args.source)
+            ),
+            concurrency=args.concurrency,
+        )
+
+        async for tender in results:
+            if tender is None:
+                failed += 1
+                continue
+
+            await writer.write(tender)
+
+    logger.info("%d tenders written, %d failed", writer.records, failed)
+
+    return 1 if failed else 0
+
+
+async def _save_attachments(
+    client: "Licitpy", code: str, directory: Path
+) -> list[Path]:
+    tender: "Tender" = await client.cl.get_by_code(code)
+
+    folder = directory / code
+    folder.mkdir(parents=True, exist_ok=True)
+
+    paths: list[Path] = []
+    names: set[str] = set()
+
+    for attachment in tender.attachments:
+        content = await attachment.content
+
+        if content is None:
+            raise ValueError(f"Attachment {attachment.name} has no content")
+
+        # Attachment names come from the remote page, never trust them as paths
+        name = Path(attachment.name).name
+
+        # A tender can list the same file name twice, keep both
+        if name in ("", "..") or name in names:
+            name = f"{attachment.id}-{name}"
+
+        names.add(name)
+
+        path = folder / name
+        path.write_bytes(base64.b64decode(content))
+
+        paths.append(path)
+
+    return paths
+
+
+async def attachments(args: argparse.Namespace) -> int:
+    from licitpy.core.concurrency import iter_completed
+
+    directory = Path(args.dir)
+    failed = 0
+
+    async with create_client(args) as client:
+        results = iter_completed(
+            (
+                _attempt(_save_attachments(client, code, directory), code)
+                for code in read_codes(args.source)
+            ),
+            concurrency=args.concurrency,
+        )
+
+        async for paths in results:
+            if paths is None:
+                failed += 1
+                continue
+
+            for path in paths:
+                print(path, flush=True)
+
+    return 1 if failed else 0
+
+
+async def eu_download(args: argparse.Namespace) -> int:
+    from licitpy.core.concurrency import iter_completed
+
+    failed = 0
+
+    async with create_client(args) as client:
+
+        async def download(when: str) -> list[dict[str, str | int | float]]:
+            # "YYYY" downloads the whole year, anything else a single month
+            if len(when) == 4 and when.isdigit():
+                return await client.eu.download_yearly_bulk_file(when)
+
+            return [await client.eu.download_monthly_bulk_file(when)]
+
+        results = iter_completed(
+            (_attempt(download(when), when) for when in args.when),
+            concurrency=args.concurrency,
+        )
+
+        async for files in results:
+            if files is None:
+                failed += 1
+                continue
+
+            for file in files:
+                print(json.dumps(file), flush=True)
+
+    return 1 if failed else 0
+
+
+def _split(values: list[str] | None) -> list[str] | None:
+    """Repeated and comma separated option values, eg: --country ES,PT --country FR."""
+
+    if values is None:
+        return None
+
+    return [
+        item.strip() for value in values for item in value.split(",") if item.strip()
+    ]
+
+
+def create_query(args: argparse.Namespace) -> "NoticeQuery | None":
+    from licitpy.countries.eu.parser import NoticeQuery
+
+    query = NoticeQuery(
+        countries=_split(args.country),
+        cpv_prefixes=_split(args.cpv),
+        published_from=args.published_from,
+        published_until=args.published_until,
+        fields=_split(args.fields),
+    )
+
+    return None if query == NoticeQuery() else query
+
+
+async def eu_ingest(args: argparse.Namespace) -> int:
+    from licitpy.countries.eu.parser import EUTenderParser
+
+    failed = 0
+
+    try:
+        query = create_query(args)
+    except ValueError as e:
+        raise SystemExit(f"licitpy: {e}") from e
+
+    # Packages are already on disk, no HTTP client is needed
+    parser = EUTenderParser()
+
+    def on_error(package: str, error: Exception) -> None:
+        nonlocal failed
+
+        logger.error("%s failed: %r", package, error)
+        failed += 1
+
+    async with create_writer(args) as writer:
+        if args.workers > 1:
+            notices = parser.iter_packages(
+                args.packages, query, max_workers=args.workers, on_error=on_error
+            )
+
+            for notice in notices:
+                await writer.write(notice)
+        else:
+            for package in args.packages:
+                try:
+                    for notice in parser.iter_package(package, query):
+                        await writer.write(notice)
+                except Exception as e:
+                    on_error(package, e)
+
+    logger.info("%d notices written, %d packages failed", writer.records, failed)
+
+    return 1 if failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from licitpy import __version__
+
+    common_options = argparse.ArgumentParser(add_help=False)
+    common_options.add_argument(
+        "-v", "--verbose", action="store_true", help="log progress information"
+    )
+
+    client_options = argparse.ArgumentParser(add_help=False, parents=[common_options])
+    client_options.add_argument(
+        "--concurrency",
+        type=int,
+        default=10,
+        help="items processed at the same time (default: %(default)s)",
+    )
+    client_options.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        metavar="RPS",
+        help="maximum HTTP requests per second (default: unlimited)",
+    )
+    client_options.add_argument(
+        "--cache",
+        choices=CACHE_MODES,
+        default="on",
+        help="HTTP cache mode, shared is safe for parallel licitpy processes (default: %(default)s)",
+    )
+    client_options.add_argument(
+        "--no-progress", action="store_true", help="do not show download progress"
+    )
+
+    output_options = argparse.ArgumentParser(add_help=False)
+    output_options.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="output file, .gz/.zst compress NDJSON (default: stdout)",
+    )
+    output_options.add_argument(
+        "--format",
+        choices=FORMATS,
+        default=None,
+        help="output format (default: from the output file extension, else ndjson)",
+    )
+
+    parser = argparse.ArgumentParser(
+        prog="licitpy",
+        description="Download and parse public tenders in bulk.",
+    )
+    parser.add_argument("--version", action="version", version=__version__)
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser(
+        "tenders",
+        parents=[client_options, output_options],
+        help="fetch Chilean tenders by code",
+    )
+    command.add_argument(
+        "source", help="file with one tender code per line, - for stdin"
+    )
+    command.set_defaults(handler=tenders)
+
+    command = commands.add_parser(
+        "attachments",
+        parents=[client_options],
+        help="download the attachments of Chilean tenders",
+    )
+    command.add_argument(
+        "source", help="file with one tender code per line, - for stdin"
+    )
+    command.add_argument(
+        "--dir", default="attachments", help="output directory (default: %(default)s)"
+    )
+    command.set_defaults(handler=attachments)
+
+    eu = commands.add_parser("eu", help="TED (EU) bulk packages")
+    eu_commands = eu.add_subparsers(dest="eu_command", required=True)
+
+    command = eu_commands.add_parser(
+        "download",
+        parents=[client_options],
+        help="download monthly (YYYY-MM) or yearly (YYYY) packages",
+    )
+    command.add_argument("when", nargs="+", help="YYYY-MM or YYYY")
+    command.set_defaults(handler=eu_download)
+
+    command = eu_commands.add_parser(
+        "ingest",
+        parents=[common_options, output_options],
+        help="parse the notices of downloaded packages",
+    )
+    command.add_argument("packages", nargs="+", help="downloaded .tar.gz packages")
+    command.add_argument(
+        "--country",
+        action="append",
+        help="keep notices of these buyer countries, eg: ES,PT (repeatable)",
+    )
+    command.add_argument(
+        "--cpv",
+        action="append",
+        metavar="PREFIX",
+        help="keep notices with a CPV code starting with these, eg: 45,71 (repeatable)",
+    )
+    command.add_argument(
+        "--from",
+        dest="published_from",
+        metavar="DATE",
+        help="first publication date to keep, YYYY-MM-DD",
+    )
+    command.add_argument(
+        "--until",
+        dest="published_until",
+        metavar="DATE",
+        help="last publication date to keep, YYYY-MM-DD",
+    )
+    command.add_argument(
+        "--fields",
+        action="append",
+        help="notice fields to extract, eg: notice_id,country (default: all)",
+    )
+    command.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="packages scanned in parallel processes (default: %(default)s)",
+    )
+    command.set_defaults(handler=eu_ingest)
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(levelname)s %(message)s",
+    )
+
+    if getattr(args, "concurrency", 1) <= 0:
+        raise SystemExit("licitpy: --concurrency must be a positive integer")
+
+    if getattr(args, "workers", 1) <= 0:
+        raise SystemExit("licitpy: --workers must be a positive integer")
+
+    try:
+        status: int = asyncio.run(args.handler(args))
+    except ImportError as e:
+        # Missing optional dependency, eg: pyarrow for Parquet output
+        raise SystemExit(f"licitpy: {e}") from e
+    except KeyboardInterrupt:
+        return 130
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
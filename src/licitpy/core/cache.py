@@ -0,0 +1,387 @@
+import asyncio
+import errno
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import IO, TYPE_CHECKING, Any, AsyncIterator
+
+from aiohttp_client_cache import SQLiteBackend
+from aiohttp_client_cache.backends.sqlite import SQLiteCache, SQLitePickleCache
+
+if TYPE_CHECKING:
+    from licitpy.core.http import SharedCacheSettings
+
+logger = logging.getLogger(__name__)
+
+# Polling interval bounds while another process holds a URL lock
+LOCK_POLL_MIN = 0.01
+LOCK_POLL_MAX = 0.25
+
+
+class SQLiteWriter:
+    """
+    Buffers the writes to the tables of one SQLite database and commits them
+    together in one short `BEGIN IMMEDIATE` transaction (group commit): when
+    `batch_size` writes are buffered, `commit_interval` seconds after the
+    first one, or on `flush`. Writes buffered while a commit runs go into the
+    next one.
+
+    Commits run in a thread on a connection of their own, so a commit waiting
+    for another process to release the database never blocks reads.
+    """
+
+    def __init__(self, filename: str, settings: "SharedCacheSettings") -> None:
+        self.filename = filename
+        self.settings = settings
+
+        self._pending: dict[tuple[str, str], Any] = {}
+        self._committing: dict[tuple[str, str], Any] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flusher: asyncio.Task[None] | None = None
+
+        self._connection: sqlite3.Connection | None = None
+        self._connect_lock = threading.Lock()
+        self._tables: set[str] = set()
+
+    def get(self, table: str, key: str) -> tuple[bool, Any]:
+        """Buffered value of `key`, if any: (found, value)."""
+
+        for writes in (self._pending, self._committing):
+            if (table, key) in writes:
+                return True, writes[table, key]
+
+        return False, None
+
+    async def discard(self, table: str, key: str) -> None:
+        """
+        Drop the buffered write of `key` before it is deleted. A write being
+        committed is waited for, so the delete is not undone by it.
+        """
+
+        self._pending.pop((table, key), None)
+
+        if (table, key) not in self._committing:
+            return
+
+        item = self._committing[table, key]
+
+        async with self._flush_lock:
+            # A failed commit puts its writes back
+            if self._pending.get((table, key)) is item:
+                del self._pending[table, key]
+
+    async def write(self, table: str, key: str, item: Any) -> None:
+        self._pending[table, key] = item
+
+        if len(self._pending) >= self.settings.batch_size:
+            await self.flush()
+
+        elif self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        try:
+            await asyncio.sleep(self.settings.commit_interval)
+            await self.flush()
+        except Exception as e:
+            # Unsaved pages are only fetched again
+            logger.warning("Could not save to the shared cache: %r", e)
+        finally:
+            self._flusher = None
+
+    async def flush(self) -> None:
+        """Commit the buffered writes."""
+
+        async with self._flush_lock:
+            if not self._pending:
+                return
+
+            self._committing, self._pending = self._pending, {}
+
+            try:
+                await asyncio.to_thread(self._commit, self._committing)
+            except BaseException:
+                # Newer writes of the same keys win over the failed ones
+                self._pending = {**self._committing, **self._pending}
+                raise
+            finally:
+                self._committing = {}
+
+    def connect(self) -> sqlite3.Connection:
+        with self._connect_lock:
+            if self._connection is not None:
+                return self._connection
+
+            # Autocommit, the transactions are explicit
+            db = sqlite3.connect(
+                self.filename,
+                timeout=self.settings.busy_timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+
+            db.execute(
+                f"PRAGMA busy_timeout = {int(self.settings.busy_timeout * 1000)}"
+            )
+
+            # Switching to WAL needs a moment alone with the database, retried
+            # while other processes open it. The mode is stored in the file.
+            for attempt in range(10):
+                try:
+                    db.execute("PRAGMA journal_mode = WAL")
+                    break
+                except sqlite3.OperationalError:
+                    if attempt == 9:
+                        raise
+
+                    time.sleep(0.1 * (attempt + 1))
+
+            # Durable at checkpoints only, a crash loses the last cached pages at most
+            db.execute("PRAGMA synchronous = NORMAL")
+
+            self._connection = db
+
+            return db
+
+    def _commit(self, writes: dict[tuple[str, str], Any]) -> None:
+        db = self.connect()
+
+        rows: dict[str, list[tuple[str, Any]]] = {}
+
+        for (table, key), item in writes.items():
+            rows.setdefault(table, []).append((key, item))
+
+        db.execute("BEGIN IMMEDIATE")
+
+        try:
+            for table, items in rows.items():
+                if table not in self._tables:
+                    db.execute(
+                        f"CREATE TABLE IF NOT EXISTS `{table}` (key PRIMARY KEY, value)"
+                    )
+                    self._tables.add(table)
+
+                db.executemany(
+                    f"INSERT OR REPLACE INTO `{table}` (key, value) VALUES (?, ?)",
+                    items,
+                )
+
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+
+        try:
+            await self.flush()
+        finally:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class SharedSQLiteCache(SQLiteCache):
+    """
+    SQLite table safe to share between processes.
+
+    The database runs in WAL mode, so readers never block the writer. Writes
+    go through a `SQLiteWriter` and are visible to this process right away.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        table_name: str,
+        writer: SQLiteWriter,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(filename, table_name, timeout=writer.settings.busy_timeout)
+
+        # Reads must not hold a transaction open, which None (autocommit)
+        # ensures. The base class drops None values from its kwargs.
+        self.connection_kwargs["isolation_level"] = None
+
+        self.writer = writer
+
+    async def _init_db(self) -> Any:
+        # Switches the database to WAL before its first read
+        await asyncio.to_thread(self.writer.connect)
+
+        return await super()._init_db()  # type: ignore[no-untyped-call]
+
+    async def _fetch(self, sql: str, parameters: tuple[Any, ...]) -> list[Any]:
+        # Run and finalized in one step. A statement left open by one task
+        # would keep every later read of the connection on an old snapshot,
+        # missing the pages committed by other processes since.
+        async with self.get_connection() as db:
+            return list(await db.execute_fetchall(sql, parameters))
+
+    async def read(self, key: str) -> Any:
+        found, item = self.writer.get(self.table_name, key)
+
+        if found:
+            return item
+
+        rows = await self._fetch(
+            f"SELECT value FROM `{self.table_name}` WHERE key = ?", (key,)
+        )
+
+        return rows[0][0] if rows else None
+
+    async def contains(self, key: str) -> bool:
+        found, _ = self.writer.get(self.table_name, key)
+
+        if found:
+            return True
+
+        rows = await self._fetch(
+            f"SELECT 1 FROM `{self.table_name}` WHERE key = ?", (key,)
+        )
+
+        return bool(rows)
+
+    async def write(self, key: str, item: Any) -> None:
+        await self.writer.write(self.table_name, key, item)
+
+    async def delete(self, key: str) -> None:
+        await self.writer.discard(self.table_name, key)
+        await super().delete(key)
+
+    async def bulk_delete(self, keys: set[str]) -> None:
+        for key in keys:
+            await self.writer.discard(self.table_name, key)
+
+        await super().bulk_delete(keys)
+
+
+class SharedSQLitePickleCache(SQLitePickleCache, SharedSQLiteCache):
+    """`SharedSQLiteCache` storing pickled responses."""
+
+
+class SharedSQLiteBackend(SQLiteBackend):
+    """`SQLiteBackend` whose tables share one `SQLiteWriter`."""
+
+    def __init__(
+        self,
+        settings: "SharedCacheSettings",
+        expire_after: Any = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(cache_name=settings.path, expire_after=expire_after, **kwargs)
+
+        self.responses = responses = SharedSQLitePickleCache(
+            settings.path, "responses", SQLiteWriter(settings.path, settings)
+        )
+
+        # Resolved by the table, eg: with the ".sqlite" suffix added
+        self.writer = responses.writer
+        self.writer.filename = responses.filename
+
+        self.redirects = SharedSQLiteCache(settings.path, "redirects", self.writer)
+
+    async def flush(self) -> None:
+        """Commit the writes buffered by every table."""
+        await self.writer.flush()
+
+    async def close(self) -> None:
+        try:
+            await self.writer.close()
+        finally:
+            await super().close()  # type: ignore[no-untyped-call]
+
+
+class SingleFlight:
+    """
+    Lets a single task, across every process sharing `path`, fetch a given
+    URL at a time. The others wait, then find the page in the shared cache.
+
+    URLs are hashed onto `stripes` byte-range locks (fcntl) of one lock file,
+    so a few unrelated URLs may wait for each other. Locks are released by
+    the OS if their process dies. After `timeout` seconds of waiting, the
+    URL is fetched anyway.
+    """
+
+    def __init__(self, path: str, stripes: int = 4096, timeout: float = 60.0) -> None:
+        try:
+            import fcntl
+        except ImportError as e:
+            raise RuntimeError(
+                "The shared cache needs POSIX file locks (fcntl), not available on this platform."
+            ) from e
+
+        self._fcntl = fcntl
+
+        self.path = path
+        self.stripes = stripes
+        self.timeout = timeout
+
+        # Byte-range locks belong to the process, tasks of one process queue here
+        self._local: dict[int, asyncio.Lock] = {}
+        self._file: IO[bytes] | None = None
+        self._pid: int | None = None
+
+    def _fileno(self) -> int:
+        # Reopened after a fork, the child does not hold the parent's locks
+        if self._file is None or self._pid != os.getpid():
+            self._file = open(self.path, "a+b")
+            self._pid = os.getpid()
+
+        return self._file.fileno()
+
+    def _stripe(self, key: str) -> int:
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") % self.stripes
+
+    def _try_lock(self, stripe: int) -> bool:
+        fcntl = self._fcntl
+
+        try:
+            fcntl.lockf(self._fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB, 1, stripe)
+        except OSError as e:
+            if e.errno in (errno.EACCES, errno.EAGAIN):
+                return False
+
+            raise
+
+        return True
+
+    def _unlock(self, stripe: int) -> None:
+        self._fcntl.lockf(self._fileno(), self._fcntl.LOCK_UN, 1, stripe)
+
+    @asynccontextmanager
+    async def hold(self, key: str) -> AsyncIterator[None]:
+        stripe = self._stripe(key)
+        local = self._local.setdefault(stripe, asyncio.Lock())
+
+        async with local:
+            # Polled instead of a blocking lockf, which would tie up a thread
+            deadline = time.monotonic() + self.timeout
+            delay = LOCK_POLL_MIN
+            locked = self._try_lock(stripe)
+
+            while not locked and time.monotonic() < deadline:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, LOCK_POLL_MAX)
+                locked = self._try_lock(stripe)
+
+            if not locked:
+                logger.warning("Timed out waiting for another process to fetch %s", key)
+
+            try:
+                yield
+            finally:
+                if locked:
+                    self._unlock(stripe)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
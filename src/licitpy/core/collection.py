@@ -0,0 +1,369 @@
+import sys
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import partial
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Sequence, overload
+
+import numpy as np
+import numpy.typing as npt
+
+from licitpy.core.enums import Attachment, FileType
+from licitpy.core.models import Tender
+
+if TYPE_CHECKING:
+    import pandas
+
+    from licitpy.core.services.attachments import AttachmentServices
+
+Mask = npt.NDArray[np.bool_]
+Indices = npt.NDArray[np.integer[Any]]
+
+# Position of each file type in its int8 column
+FILE_TYPES: tuple[FileType, ...] = tuple(FileType)
+FILE_TYPE_CODES: dict[FileType, int] = {
+    file_type: code for code, file_type in enumerate(FILE_TYPES)
+}
+
+
+def _intern(value: str | None) -> str | None:
+    return sys.intern(value) if value is not None else None
+
+
+def _to_microseconds(value: datetime) -> int:
+    if value.tzinfo is None:
+        raise ValueError("Dates must be timezone aware.")
+
+    delta = value - datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _strings(values: list[str | None]) -> npt.NDArray[np.object_]:
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+
+    return array
+
+
+class TenderCollection:
+    """
+    Columnar, immutable set of tenders for bulk filtering.
+
+    Tenders are stored as NumPy columns: closing dates as int64 UTC
+    microseconds, file types as int8 codes and repeated strings (attachment
+    types, upload dates, file names, ...) interned so each distinct value is
+    stored once. Attachments are flattened into their own columns, with
+    `attachment_offsets` marking where each tender's attachments start.
+
+    Predicates return boolean masks over the tenders, evaluated for the
+    whole collection at once, and `filter` keeps the matching tenders:
+
+    tenders = TenderCollection.from_tenders(results, client.cl.attachment)
+    now = datetime.now(timezone.utc)
+    pdfs_closing_soon = tenders.filter(
+        tenders.closing_within(timedelta(days=7), now)
+        & tenders.has_file_type(FileType.PDF)
+    )
+
+    for tender in pdfs_closing_soon:  # Tender objects are built on demand
+        ...
+    """
+
+    def __init__(
+        self,
+        codes: npt.NDArray[np.object_],
+        titles: npt.NDArray[np.object_],
+        closing_dates: npt.NDArray[np.int64],
+        timezones: npt.NDArray[np.object_],
+        attachment_urls: npt.NDArray[np.object_],
+        attachment_offsets: npt.NDArray[np.int64],
+        attachment_columns: dict[str, npt.NDArray[Any]],
+        attachment_services: "AttachmentServices | None" = None,
+    ) -> None:
+        self.codes = codes
+        self.titles = titles
+        self.closing_dates = closing_dates
+        self.timezones = timezones
+        self.attachment_urls = attachment_urls
+        self.attachment_offsets = attachment_offsets
+        self.attachments = attachment_columns
+        self.attachment_services = attachment_services
+
+        # Index of the tender each attachment belongs to
+        self._attachment_tender = np.repeat(
+            np.arange(len(codes)), np.diff(attachment_offsets)
+        )
+
+    @classmethod
+    def from_tenders(
+        cls,
+        tenders: Iterable[Tender],
+        attachment_services: "AttachmentServices | None" = None,
+    ) -> "TenderCollection":
+        """
+        Args:
+            tenders: Tenders to store, eg: the results of `get_by_code`.
+            attachment_services: Used to rebind the attachment downloads of
+                the tenders built back from the collection. Without it, their
+                attachment content cannot be downloaded.
+        """
+
+        codes: list[str | None] = []
+        titles: list[str | None] = []
+        closing_dates: list[int] = []
+        timezones: list[tzinfo | None] = []
+        attachment_urls: list[str | None] = []
+        offsets = [0]
+
+        ids: list[str | None] = []
+        names: list[str | None] = []
+        types: list[str | None] = []
+        descriptions: list[str | None] = []
+        sizes: list[int] = []
+        upload_dates: list[str | None] = []
+        file_types: list[int] = []
+
+        for tender in tenders:
+            codes.append(tender.code)
+            titles.append(tender.title)
+            closing_dates.append(_to_microseconds(tender.closing_date))
+            timezones.append(tender.closing_date.tzinfo)
+            attachment_urls.append(_intern(str(tender.attachment_url)))
+
+            for attachment in tender.attachments:
+                ids.append(attachment.id)
+                names.append(_intern(attachment.name))
+                types.append(_intern(attachment.type))
+                descriptions.append(_intern(attachment.description))
+                sizes.append(attachment.size)
+                upload_dates.append(_intern(attachment.upload_date))
+                file_types.append(FILE_TYPE_CODES[attachment.file_type])
+
+            offsets.append(len(ids))
+
+        return cls(
+            codes=_strings(codes),
+            titles=_strings(titles),
+            closing_dates=np.array(closing_dates, dtype=np.int64),
+            timezones=np.array(timezones, dtype=object),
+            attachment_urls=_strings(attachment_urls),
+            attachment_offsets=np.array(offsets, dtype=np.int64),
+            attachment_columns={
+                "id": _strings(ids),
+                "name": _strings(names),
+                "type": _strings(types),
+                "description": _strings(descriptions),
+                "size": np.array(sizes, dtype=np.int64),
+                "upload_date": _strings(upload_dates),
+                "file_type": np.array(file_types, dtype=np.int8),
+            },
+            attachment_services=attachment_services,
+        )
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    # Predicates
+
+    def open_at(self, when: datetime | None = None) -> Mask:
+        """Tenders still open at `when` (now by default)."""
+
+        when = when or datetime.now(timezone.utc)
+
+        return self.closing_dates > _to_microseconds(when)
+
+    def closing_within(self, period: timedelta, start: datetime | None = None) -> Mask:
+        """Tenders closing between `start` (now by default) and `start + period`."""
+
+        start = start or datetime.now(timezone.utc)
+
+        begin = _to_microseconds(start)
+        end = _to_microseconds(start + period)
+
+        return (self.closing_dates > begin) & (self.closing_dates <= end)
+
+    def closing_between(self, start: datetime, end: datetime) -> Mask:
+        begin, finish = _to_microseconds(start), _to_microseconds(end)
+        return (self.closing_dates >= begin) & (self.closing_dates < finish)
+
+    def has_file_type(self, *file_types: FileType) -> Mask:
+        """Tenders with at least one attachment of any of `file_types`."""
+
+        codes = [FILE_TYPE_CODES[file_type] for file_type in file_types]
+        matches = np.isin(self.attachments["file_type"], codes)
+
+        return np.bincount(self._attachment_tender[matches], minlength=len(self)) > 0
+
+    # Aggregates
+
+    def attachment_counts(self) -> npt.NDArray[np.int64]:
+        return np.diff(self.attachment_offsets)
+
+    def attachment_sizes(self) -> npt.NDArray[np.int64]:
+        """Total attachment bytes of each tender."""
+
+        return np.bincount(
+            self._attachment_tender,
+            weights=self.attachments["size"],
+            minlength=len(self),
+        ).astype(np.int64)
+
+    def total_attachment_size(self, file_type: FileType | None = None) -> int:
+        """Bytes of every attachment, or only those of `file_type`."""
+
+        sizes = self.attachments["size"]
+
+        if file_type is not None:
+            sizes = sizes[self.attachments["file_type"] == FILE_TYPE_CODES[file_type]]
+
+        return int(sizes.sum())
+
+    def file_type_counts(self) -> dict[FileType, int]:
+        counts = np.bincount(self.attachments["file_type"], minlength=len(FILE_TYPES))
+        return {
+            FILE_TYPES[code]: int(count) for code, count in enumerate(counts) if count
+        }
+
+    # Selection
+
+    def take(self, indices: Indices) -> "TenderCollection":
+        """New collection with the tenders at `indices`, in that order."""
+
+        starts = self.attachment_offsets[indices]
+        counts = self.attachment_offsets[indices + 1] - starts
+
+        # Positions of the attachments of the selected tenders
+        positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(
+            counts.sum()
+        )
+
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        return TenderCollection(
+            codes=self.codes[indices],
+            titles=self.titles[indices],
+            closing_dates=self.closing_dates[indices],
+            timezones=self.timezones[indices],
+            attachment_urls=self.attachment_urls[indices],
+            attachment_offsets=offsets,
+            attachment_columns={
+                name: column[positions] for name, column in self.attachments.items()
+            },
+            attachment_services=self.attachment_services,
+        )
+
+    def filter(self, mask: Mask) -> "TenderCollection":
+        """New collection with the tenders where `mask` is True."""
+        return self.take(np.flatnonzero(mask))
+
+    # Conversion back to models
+
+    def _attachment(self, position: int, attachment_url: str) -> Attachment:
+        columns = self.attachments
+
+        attachment = Attachment.from_trusted(
+            id=columns["id"][position],
+            name=columns["name"][position],
+            type=columns["type"][position],
+            description=columns["description"][position],
+            size=int(columns["size"][position]),
+            upload_date=columns["upload_date"][position],
+            file_type=FILE_TYPES[columns["file_type"][position]],
+        )
+
+        if self.attachment_services is not None:
+            attachment._download_fn = partial(
+                self.attachment_services.download_attachment_from_url,
+                attachment_url,
+                attachment,
+            )
+
+        return attachment
+
+    def tender(self, index: int) -> Tender:
+        """Build the `Tender` at `index`."""
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("TenderCollection index out of range")
+
+        attachment_url: str = self.attachment_urls[index]
+        start, end = self.attachment_offsets[index : index + 2]
+
+        closing_date = datetime.fromtimestamp(
+            int(self.closing_dates[index]) / 1_000_000, tz=timezone.utc
+        ).astimezone(self.timezones[index])
+
+        return Tender.from_trusted(
+            code=self.codes[index],
+            title=self.titles[index],
+            closing_date=closing_date,
+            attachment_url=attachment_url,
+            attachments=[
+                self._attachment(position, attachment_url)
+                for position in range(start, end)
+            ],
+        )
+
+    @overload
+    def __getitem__(self, key: int) -> Tender: ...
+
+    @overload
+    def __getitem__(
+        self, key: slice | Mask | Indices | Sequence[int] | Sequence[bool]
+    ) -> "TenderCollection": ...
+
+    def __getitem__(
+        self, key: int | slice | Mask | Indices | Sequence[int] | Sequence[bool]
+    ) -> "Tender | TenderCollection":
+        if isinstance(key, (int, np.integer)):
+            return self.tender(int(key))
+
+        if isinstance(key, slice):
+            return self.take(np.arange(len(self))[key])
+
+        # Plain lists of positions or flags work like their arrays
+        array = np.asarray(key)
+
+        if array.dtype == np.bool_:
+            return self.take(np.flatnonzero(array))
+
+        return self.take(array.astype(np.intp))
+
+    def __iter__(self) -> Iterator[Tender]:
+        for index in range(len(self)):
+            yield self.tender(index)
+
+    def to_pandas(self) -> "pandas.DataFrame":
+        """One row per tender, with attachment counts and total sizes."""
+
+        import pandas
+
+        return pandas.DataFrame(
+            {
+                "code": self.codes,
+                "title": self.titles,
+                "closing_date": pandas.to_datetime(
+                    self.closing_dates, unit="us", utc=True
+                ),
+                "attachment_url": self.attachment_urls,
+                "attachments": self.attachment_counts(),
+                "attachment_size": self.attachment_sizes(),
+            }
+        )
+
+    def attachments_to_pandas(self) -> "pandas.DataFrame":
+        """One row per attachment, with the code of its tender."""
+
+        import pandas
+
+        columns = dict(self.attachments)
+        columns["file_type"] = pandas.Categorical.from_codes(
+            columns["file_type"], categories=[value.value for value in FILE_TYPES]
+        )
+
+        return pandas.DataFrame(
+            {"tender_code": self.codes[self._attachment_tender], **columns}
+        )
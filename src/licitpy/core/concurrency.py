@@ -0,0 +1,111 @@
+import asyncio
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Iterable, TypeVar
+
+T = TypeVar("T")
+
+
+async def iter_completed(
+    awaitables: Iterable[Awaitable[T]], concurrency: int = 10
+) -> AsyncIterator[T]:
+    """
+    Run awaitables with bounded concurrency and yield results as they complete.
+
+    Unlike `asyncio.gather`, results are handed over one by one, so a consumer
+    such as `NDJSONWriter.write_all` can persist them without holding the whole
+    batch in memory. Pending awaitables are only scheduled when a slot frees up.
+
+    When an awaitable fails, the results that completed with it are yielded
+    first, then its exception is raised and the running ones are cancelled.
+    """
+
+    if concurrency <= 0:
+        raise ValueError("concurrency must be a positive integer.")
+
+    iterator = iter(awaitables)
+    pending: set[asyncio.Future[T]] = set()
+    finished: deque[asyncio.Future[T]] = deque()
+
+    def schedule() -> bool:
+        try:
+            awaitable = next(iterator)
+        except StopIteration:
+            return False
+
+        pending.add(asyncio.ensure_future(awaitable))
+        return True
+
+    try:
+        while len(pending) < concurrency and schedule():
+            pass
+
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            for _ in done:
+                schedule()
+
+            finished.extend(done)
+            error: BaseException | None = None
+
+            # The whole batch is handed over before its first failure is raised
+            while finished:
+                future = finished.popleft()
+                failure = future.exception()
+
+                if failure is None:
+                    yield future.result()
+                elif error is None:
+                    error = failure
+
+            if error is not None:
+                raise error
+    finally:
+        for future in pending:
+            future.cancel()
+
+        # Retrieved so a consumer stopping early leaves no unseen exception
+        for future in finished:
+            if not future.cancelled():
+                future.exception()
+
+
+class RateLimiter:
+    """
+    Token bucket allowing `rate` acquisitions per second, with bursts of up
+    to `burst`. Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+
+        if burst <= 0:
+            raise ValueError("burst must be a positive integer.")
+
+        self.rate = rate
+        self.burst = burst
+
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+                self._tokens = 1
+                self._updated_at = time.monotonic()
+
+            self._tokens -= 1
@@ -0,0 +1,86 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+CHILE_TIMEZONE = "America/Santiago"
+
+# eg: 06-08-2024 9:11:02 (same fields accepted by "%d-%m-%Y %H:%M:%S")
+_DAY_MONTH_YEAR_TIME = re.compile(
+    r"(\d{1,2})-(\d{1,2})-(\d{4}) (\d{1,2}):(\d{1,2}):(\d{1,2})"
+)
+
+# eg: 2023-10 or 2023-1
+_YEAR_MONTH = re.compile(r"(\d{4})-(\d{1,2})")
+
+
+@lru_cache(maxsize=None)
+def get_timezone(name: str) -> ZoneInfo:
+    """Return a cached timezone object."""
+    return ZoneInfo(name)
+
+
+def parse_day_month_year_time(value: str, timezone: str = CHILE_TIMEZONE) -> datetime:
+    """
+    Parse a "dd-mm-YYYY HH:MM:SS" string into a timezone-aware datetime.
+
+    Equivalent to `datetime.strptime(value, "%d-%m-%Y %H:%M:%S")` followed by
+    `.replace(tzinfo=ZoneInfo(timezone))`, without the strptime overhead.
+    """
+
+    match = _DAY_MONTH_YEAR_TIME.fullmatch(value)
+
+    if not match:
+        raise ValueError(
+            f"Invalid date format: {value}. Expected format is dd-mm-YYYY HH:MM:SS."
+        )
+
+    day, month, year, hour, minute, second = map(int, match.groups())
+
+    return datetime(
+        year, month, day, hour, minute, second, tzinfo=get_timezone(timezone)
+    )
+
+
+def parse_year_month(value: str) -> datetime | None:
+    """
+    Parse a "YYYY-MM" string into a datetime on the first day of the month.
+
+    Returns None when the string does not follow that format.
+    """
+
+    match = _YEAR_MONTH.fullmatch(value.strip())
+
+    if not match:
+        return None
+
+    year, month = map(int, match.groups())
+
+    if not 1 <= month <= 12:
+        return None
+
+    return datetime(year, month, 1)
+
+
+def parse_date(value: str) -> datetime | None:
+    """
+    Parse a date string, trying fixed formats before free-form parsing.
+
+    "YYYY-MM" and ISO 8601 strings are handled directly. Anything else is
+    passed to `dateparser`, which is only imported when it is needed.
+    Returns None when the string cannot be parsed.
+    """
+
+    when = parse_year_month(value)
+
+    if when is not None:
+        return when
+
+    try:
+        return datetime.fromisoformat(value.strip())
+    except ValueError:
+        pass
+
+    import dateparser
+
+    return dateparser.parse(value)
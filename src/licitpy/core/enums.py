@@ -1,8 +1,11 @@
+from dataclasses import dataclass
 from enum import Enum
 from typing import Awaitable, Callable, Optional
 
 from pydantic import BaseModel, PrivateAttr
 
+from licitpy.core.trusted import construct_trusted
+
 
 class FileType(Enum):
     DOC = "doc"
@@ -19,6 +22,13 @@ class FileType(Enum):
     XLS = "xls"
     XLSX = "xlsx"
     ZIP = "zip"
+    UNKNOWN = "unknown"
+
+
+class Compression(Enum):
+    NONE = "none"
+    GZIP = "gzip"
+    ZSTD = "zstd"
 
 
 class ContentStatus(Enum):
@@ -45,8 +55,56 @@ class Attachment(BaseModel):
     _download_fn: Callable[[], Awaitable[str]] = PrivateAttr()
     _content: Optional[str] = PrivateAttr(default=None)
 
+    @classmethod
+    def from_trusted(
+        cls,
+        id: str,
+        name: str,
+        type: str,
+        description: str | None,
+        size: int,
+        upload_date: str,
+        file_type: FileType,
+    ) -> "Attachment":
+        """
+        Build an attachment from values already checked by our own parsers.
+
+        Skips pydantic validation, so callers must pass correctly typed values.
+        """
+
+        return construct_trusted(
+            cls,
+            {
+                "id": id,
+                "name": name,
+                "type": type,
+                "description": description,
+                "size": size,
+                "upload_date": upload_date,
+                "file_type": file_type,
+            },
+        )
+
+    def to_record(self) -> "AttachmentRecord":
+        return AttachmentRecord(
+            id=self.id,
+            name=self.name,
+            type=self.type,
+            description=self.description,
+            size=self.size,
+            upload_date=self.upload_date,
+            file_type=self.file_type,
+        )
+
     @property
     async def content(self) -> Optional[str]:
+        """
+        The file, base64 encoded, downloaded on first access.
+
+        The download also updates `file_type` with the type sniffed from the
+        content, which is more reliable than the name-based guess.
+        """
+
         if self._content is None:
             self._content = await self._download_fn()
 
@@ -58,3 +116,32 @@ class Attachment(BaseModel):
             return ContentStatus.PENDING_DOWNLOAD
 
         return ContentStatus.AVAILABLE
+
+
+@dataclass(slots=True, frozen=True)
+class AttachmentRecord:
+    """
+    Lightweight, slotted attachment row for bulk pipelines.
+
+    Holds the same fields as `Attachment` without the pydantic machinery or
+    the download function. Use `to_attachment()` to get the full model back.
+    """
+
+    id: str
+    name: str
+    type: str
+    description: str | None
+    size: int
+    upload_date: str
+    file_type: FileType
+
+    def to_attachment(self) -> Attachment:
+        return Attachment.from_trusted(
+            id=self.id,
+            name=self.name,
+            type=self.type,
+            description=self.description,
+            size=self.size,
+            upload_date=self.upload_date,
+            file_type=self.file_type,
+        )
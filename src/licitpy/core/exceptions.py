@@ -32,3 +32,15 @@ class AttachmentDownloadError(Exception):
 
 class AttachmentUrlHashNotFound(Exception):
     """Raised when the attachment URL hash is not found or is empty in the HTML content."""
+
+
+class FixtureNotFoundError(Exception):
+    """Raised when a request has no recorded response in the fixture archive."""
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is rejected because the host's circuit breaker is open."""
+
+
+class UnsupportedFileTypeError(Exception):
+    """Raised when text cannot be extracted from a file type."""
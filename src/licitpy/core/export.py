@@ -0,0 +1,356 @@
+import asyncio
+import sys
+import zlib
+from abc import ABC, abstractmethod
+from importlib.util import find_spec
+from pathlib import Path
+from types import TracebackType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    BinaryIO,
+    Iterable,
+    Optional,
+    Protocol,
+    Type,
+)
+
+import aiofiles
+from aiofiles.threadpool.binary import AsyncBufferedIOBase
+from pydantic import BaseModel
+
+from licitpy.core.enums import Compression
+
+if TYPE_CHECKING:
+    import pyarrow
+    import pyarrow.parquet
+
+SUFFIXES = {
+    Compression.NONE: "",
+    Compression.GZIP: ".gz",
+    Compression.ZSTD: ".zst",
+}
+
+
+class _Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class _Identity:
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def flush(self) -> bytes:
+        return b""
+
+
+def _get_compressor(compression: Compression, level: int | None) -> _Compressor:
+    if compression is Compression.GZIP:
+        # wbits=31 writes a gzip header/trailer, so the output is a valid .gz file
+        return zlib.compressobj(6 if level is None else level, zlib.DEFLATED, 31)
+
+    if compression is Compression.ZSTD:
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                "zstd compression requires the 'zstandard' package: pip install zstandard"
+            ) from e
+
+        return zstandard.ZstdCompressor(
+            level=3 if level is None else level
+        ).compressobj()
+
+    return _Identity()
+
+
+class RecordWriter(ABC):
+    """Streams pydantic models to files, see `NDJSONWriter` and `ParquetWriter`."""
+
+    records: int
+
+    @abstractmethod
+    async def write(self, record: BaseModel) -> None: ...
+
+    @abstractmethod
+    async def close(self) -> None: ...
+
+    async def write_all(
+        self, records: AsyncIterable[BaseModel] | Iterable[BaseModel]
+    ) -> int:
+        """
+        Write every record from a (async) iterable as it is produced.
+
+        Returns the number of records written by this call.
+        """
+
+        written = 0
+
+        if isinstance(records, AsyncIterable):
+            async for record in records:
+                await self.write(record)
+                written += 1
+        else:
+            for record in records:
+                await self.write(record)
+                written += 1
+
+        return written
+
+    async def __aenter__(self) -> "RecordWriter":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.close()
+
+
+class NDJSONWriter(RecordWriter):
+    """
+    Streams pydantic models (e.g. `Tender`) to newline-delimited JSON files.
+
+    Records are serialised with pydantic-core's JSON encoder, buffered in
+    memory and flushed in large blocks, compressed on the fly and optionally
+    rotated across several files.
+
+    async with NDJSONWriter("out/tenders.ndjson", compression=Compression.GZIP) as writer:
+        await writer.write_all(tenders)
+
+    Args:
+        path: Base output path. The compression suffix is appended if missing.
+        compression: Output compression.
+        compression_level: Compressor level, or None for the codec default.
+        buffer_size: Uncompressed bytes to accumulate before writing to disk.
+        max_bytes: Rotate to a new file before its uncompressed size exceeds this.
+        max_records: Rotate to a new file after this many records.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        compression: Compression = Compression.NONE,
+        compression_level: int | None = None,
+        buffer_size: int = 1 << 20,
+        max_bytes: int | None = None,
+        max_records: int | None = None,
+    ) -> None:
+        if buffer_size <= 0:
+            raise ValueError("buffer_size must be a positive number of bytes.")
+
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("max_bytes must be positive.")
+
+        if max_records is not None and max_records <= 0:
+            raise ValueError("max_records must be positive.")
+
+        self._path = Path(path)
+        self._compression = compression
+        self._compression_level = compression_level
+        self._buffer_size = buffer_size
+        self._max_bytes = max_bytes
+        self._max_records = max_records
+
+        self._buffer = bytearray()
+        self._file: AsyncBufferedIOBase | None = None
+        self._compressor: _Compressor = _Identity()
+
+        self._file_index = 0
+        self._file_bytes = 0
+        self._file_records = 0
+
+        self.files: list[Path] = []
+        self.records = 0
+
+    @property
+    def rotates(self) -> bool:
+        return self._max_bytes is not None or self._max_records is not None
+
+    def _next_path(self) -> Path:
+        suffix = SUFFIXES[self._compression]
+        name = self._path.name
+
+        if suffix and name.endswith(suffix):
+            name = name[: -len(suffix)]
+
+        if self.rotates:
+            stem, dot, extension = name.partition(".")
+            name = f"{stem}.{self._file_index:05d}{dot}{extension}"
+
+        return self._path.with_name(f"{name}{suffix}")
+
+    async def _open_next(self) -> None:
+        path = self._next_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._file = await aiofiles.open(path, "wb")
+        self._compressor = _get_compressor(self._compression, self._compression_level)
+
+        self._file_index += 1
+        self._file_bytes = 0
+        self._file_records = 0
+
+        self.files.append(path)
+
+    async def _flush_buffer(self) -> None:
+        if not self._buffer or self._file is None:
+            return
+
+        data = self._compressor.compress(bytes(self._buffer))
+        self._buffer.clear()
+
+        if data:
+            await self._file.write(data)
+
+    async def _close_file(self) -> None:
+        if self._file is None:
+            return
+
+        await self._flush_buffer()
+        await self._file.write(self._compressor.flush())
+        await self._file.close()
+
+        self._file = None
+
+    def _must_rotate(self, size: int) -> bool:
+        if not self._file_records:
+            return False
+
+        if self._max_records is not None and self._file_records >= self._max_records:
+            return True
+
+        return self._max_bytes is not None and self._file_bytes + size > self._max_bytes
+
+    async def write(self, record: BaseModel) -> None:
+        """Serialise one record and append it to the current file."""
+
+        line = record.__pydantic_serializer__.to_json(record) + b"\n"
+
+        if self._file is None:
+            await self._open_next()
+
+        elif self._must_rotate(len(line)):
+            await self._close_file()
+            await self._open_next()
+
+        self._buffer += line
+
+        self._file_bytes += len(line)
+        self._file_records += 1
+        self.records += 1
+
+        if len(self._buffer) >= self._buffer_size:
+            await self._flush_buffer()
+
+    async def close(self) -> None:
+        """Flush pending data and close the current file."""
+        await self._close_file()
+
+    async def __aenter__(self) -> "NDJSONWriter":
+        return self
+
+
+class StreamWriter(RecordWriter):
+    """
+    Writes records as NDJSON to a binary stream, stdout by default, flushing
+    after every record so consumers of a pipe see results as they complete.
+    """
+
+    def __init__(self, stream: BinaryIO | None = None) -> None:
+        self._stream = stream if stream is not None else sys.stdout.buffer
+        self.records = 0
+
+    async def write(self, record: BaseModel) -> None:
+        self._stream.write(record.__pydantic_serializer__.to_json(record) + b"\n")
+        self._stream.flush()
+
+        self.records += 1
+
+    async def close(self) -> None:
+        self._stream.flush()
+
+
+class ParquetWriter(RecordWriter):
+    """
+    Streams pydantic models to a Parquet file, one row group per `batch_size`
+    records. Requires the optional `pyarrow` package.
+
+    Records are dumped in JSON mode (datetimes and URLs become strings) and
+    the schema is inferred from the first batch.
+
+    async with ParquetWriter("out/tenders.parquet") as writer:
+        await writer.write_all(tenders)
+
+    Args:
+        path: Output file.
+        batch_size: Records buffered in memory before a row group is written.
+        compression: Parquet compression codec.
+    """
+
+    def __init__(
+        self, path: str | Path, batch_size: int = 10_000, compression: str = "zstd"
+    ) -> None:
+        if batch_size <= 0:
+            raise ValueError("batch_size must be a positive integer.")
+
+        # Fail early, rather than on the first flush
+        if find_spec("pyarrow") is None:
+            raise ImportError(
+                "Parquet output requires the 'pyarrow' package: pip install pyarrow"
+            )
+
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.compression = compression
+
+        self._rows: list[dict[str, Any]] = []
+        self._writer: "pyarrow.parquet.ParquetWriter | None" = None
+        self._schema: "pyarrow.Schema | None" = None
+
+        self.records = 0
+
+    def _write_rows(self, rows: list[dict[str, Any]]) -> None:
+        import pyarrow
+        import pyarrow.parquet
+
+        table = pyarrow.Table.from_pylist(rows, schema=self._schema)
+
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            self._schema = table.schema
+            self._writer = pyarrow.parquet.ParquetWriter(
+                self.path, table.schema, compression=self.compression
+            )
+
+        self._writer.write_table(table)
+
+    async def _flush(self) -> None:
+        if not self._rows:
+            return
+
+        rows, self._rows = self._rows, []
+
+        await asyncio.to_thread(self._write_rows, rows)
+
+    async def write(self, record: BaseModel) -> None:
+        self._rows.append(record.model_dump(mode="json"))
+        self.records += 1
+
+        if len(self._rows) >= self.batch_size:
+            await self._flush()
+
+    async def close(self) -> None:
+        """Write the pending rows and the Parquet footer."""
+
+        await self._flush()
+
+        if self._writer is not None:
+            await asyncio.to_thread(self._writer.close)
+            self._writer = None
@@ -0,0 +1,352 @@
+import asyncio
+import base64
+import hashlib
+import io
+import os
+import zipfile
+from concurrent.futures import Executor
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, Callable, Optional, Type
+
+from licitpy.core.enums import FileType
+from licitpy.core.exceptions import UnsupportedFileTypeError
+from licitpy.core.filetypes import SNIFF_BYTES, sniff_file_type
+
+if TYPE_CHECKING:
+    from lxml.etree import _Element
+
+    from licitpy.core.enums import Attachment
+
+# Archive members larger than this are skipped, as well as archives nested
+# deeper than MAX_ZIP_DEPTH (protects against zip bombs).
+MAX_ZIP_MEMBER_SIZE = 256 * 1024 * 1024
+MAX_ZIP_DEPTH = 3
+
+# Part of the cache keys, bump it when extraction changes to drop stale texts
+EXTRACTOR_VERSION = 1
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_S = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_TEXT = "{urn:oasis:names:tc:opendocument:xmlns:text:1.0}"
+
+
+def _parse_xml(data: bytes) -> "_Element":
+    from lxml import etree
+
+    # Office documents are produced by third parties, never resolve entities
+    parser = etree.XMLParser(resolve_entities=False, no_network=True)
+
+    return etree.fromstring(data, parser)
+
+
+def _extract_pdf(data: bytes) -> str:
+    try:
+        from pypdf import PdfReader
+    except ImportError as e:
+        raise ImportError(
+            "PDF text extraction requires the 'pypdf' package: pip install pypdf"
+        ) from e
+
+    reader = PdfReader(io.BytesIO(data))
+
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def _extract_docx(data: bytes) -> str:
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        root = _parse_xml(archive.read("word/document.xml"))
+
+    return "\n".join(
+        "".join(node.text or "" for node in paragraph.iter(f"{_W}t"))
+        for paragraph in root.iter(f"{_W}p")
+    )
+
+
+def _extract_xlsx(data: bytes) -> str:
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        names = archive.namelist()
+
+        shared: list[str] = []
+
+        if "xl/sharedStrings.xml" in names:
+            shared = [
+                "".join(node.text or "" for node in item.iter(f"{_S}t"))
+                for item in _parse_xml(archive.read("xl/sharedStrings.xml")).iter(
+                    f"{_S}si"
+                )
+            ]
+
+        sheets = sorted(
+            name
+            for name in names
+            if name.startswith("xl/worksheets/") and name.endswith(".xml")
+        )
+
+        lines: list[str] = []
+
+        for sheet in sheets:
+            for row in _parse_xml(archive.read(sheet)).iter(f"{_S}row"):
+                cells: list[str] = []
+
+                for cell in row.iter(f"{_S}c"):
+                    kind = cell.get("t")
+
+                    if kind == "inlineStr":
+                        cells.append(
+                            "".join(node.text or "" for node in cell.iter(f"{_S}t"))
+                        )
+                        continue
+
+                    value = cell.findtext(f"{_S}v")
+
+                    if value is None:
+                        continue
+
+                    cells.append(shared[int(value)] if kind == "s" else value)
+
+                if cells:
+                    lines.append("\t".join(cells))
+
+            lines.append("")
+
+    return "\n".join(lines).strip()
+
+
+def _extract_odt(data: bytes) -> str:
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        root = _parse_xml(archive.read("content.xml"))
+
+    return "\n".join(
+        "".join(text for text in node.itertext() if isinstance(text, str))
+        for node in root.iter()
+        if node.tag in (f"{_TEXT}p", f"{_TEXT}h")
+    )
+
+
+def _extract_zip(data: bytes, depth: int) -> str:
+    if depth > MAX_ZIP_DEPTH:
+        return ""
+
+    parts: list[str] = []
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        for member in archive.infolist():
+            if member.is_dir() or member.file_size > MAX_ZIP_MEMBER_SIZE:
+                continue
+
+            with archive.open(member) as file:
+                head = file.read(SNIFF_BYTES)
+
+            # Skip members we cannot extract without reading them whole
+            file_type = sniff_file_type(head, member.filename)
+
+            if file_type not in _SUPPORTED:
+                continue
+
+            content = archive.read(member)
+
+            try:
+                text = _extract(content, file_type, depth + 1)
+            except (UnsupportedFileTypeError, ImportError):
+                continue
+
+            if text.strip():
+                parts.append(f"--- {member.filename} ---\n{text}")
+
+    return "\n\n".join(parts)
+
+
+_EXTRACTORS: dict[FileType, Callable[[bytes], str]] = {
+    FileType.PDF: _extract_pdf,
+    FileType.DOCX: _extract_docx,
+    FileType.XLSX: _extract_xlsx,
+    FileType.ODT: _extract_odt,
+}
+
+_SUPPORTED = {*_EXTRACTORS, FileType.ZIP}
+
+
+def _container_type(data: bytes) -> FileType:
+    """Tell office documents apart from plain ZIP archives by their members."""
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        names = set(archive.namelist())
+
+    if "word/document.xml" in names:
+        return FileType.DOCX
+
+    if "xl/workbook.xml" in names:
+        return FileType.XLSX
+
+    if "content.xml" in names and "mimetype" in names:
+        return FileType.ODT
+
+    return FileType.ZIP
+
+
+def _extract(data: bytes, file_type: FileType | None, depth: int) -> str:
+    if file_type is None or file_type is FileType.UNKNOWN:
+        file_type = sniff_file_type(data[:SNIFF_BYTES])
+
+    if file_type is FileType.ZIP:
+        file_type = _container_type(data)
+
+    if file_type is FileType.ZIP:
+        return _extract_zip(data, depth)
+
+    extractor = _EXTRACTORS.get(file_type)
+
+    if extractor is None:
+        raise UnsupportedFileTypeError(
+            f"Text extraction is not supported for {file_type.value} files"
+        )
+
+    return extractor(data)
+
+
+def extract_text(data: bytes, file_type: FileType | None = None) -> str:
+    """
+    Extract the text of a PDF, DOCX, XLSX, ODT or ZIP file (recursively).
+
+    The type is sniffed from the content when not given. PDF support needs
+    the optional `pypdf` package. Blocking and CPU bound: `TextExtractor`
+    runs it in a process pool.
+    """
+
+    return _extract(data, file_type, 0)
+
+
+class TextExtractor:
+    """
+    Extracts attachment text in a process pool and caches it by content hash,
+    file type and `EXTRACTOR_VERSION`.
+
+    The same content (eg: a bidding rules PDF attached to hundreds of
+    tenders) is extracted once: later calls read the cache, and concurrent
+    calls for the same content wait for the extraction already in progress.
+
+    async with TextExtractor(cache_dir="text_cache") as extractor:
+        text = await extractor.extract_attachment(attachment)
+
+    Args:
+        cache_dir: Directory of the on-disk cache, shared by every process
+            using it. With None, results are only cached in memory.
+        executor: Executor to extract in. Defaults to a process pool of
+            `max_workers` processes (one per core), closed with the extractor.
+        max_workers: Size of the default process pool.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = "licitpy_text_cache",
+        executor: Executor | None = None,
+        max_workers: int | None = None,
+    ) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_workers = max_workers
+
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._memory: dict[str, str] = {}
+        self._in_flight: dict[str, asyncio.Task[str]] = {}
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        return self._executor
+
+    def _cache_path(self, key: str) -> Path:
+        assert self.cache_dir is not None
+        return self.cache_dir / key[:2] / f"{key}.txt"
+
+    def _read_cache(self, key: str) -> str | None:
+        if self.cache_dir is None:
+            return self._memory.get(key)
+
+        try:
+            return self._cache_path(key).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def _write_cache(self, key: str, text: str) -> None:
+        if self.cache_dir is None:
+            self._memory[key] = text
+            return
+
+        path = self._cache_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write then rename, so other processes never read a partial entry
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_text(text, encoding="utf-8")
+        temporary.replace(path)
+
+    async def _extract(self, key: str, data: bytes, file_type: FileType | None) -> str:
+        cached = await asyncio.to_thread(self._read_cache, key)
+
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        text = await loop.run_in_executor(
+            self._get_executor(), extract_text, data, file_type
+        )
+
+        await asyncio.to_thread(self._write_cache, key, text)
+
+        return text
+
+    @staticmethod
+    def _cache_key(data: bytes, file_type: FileType | None) -> str:
+        # The text depends on the type it is extracted as, not only the bytes
+        if file_type is None or file_type is FileType.UNKNOWN:
+            kind = "sniffed"
+        else:
+            kind = file_type.value
+
+        return f"{hashlib.sha256(data).hexdigest()}-{kind}-v{EXTRACTOR_VERSION}"
+
+    async def extract(self, data: bytes, file_type: FileType | None = None) -> str:
+        """Text of `data`, from the cache when the same content was seen before."""
+
+        key = self._cache_key(data, file_type)
+        task = self._in_flight.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(self._extract(key, data, file_type))
+
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        # A cancelled caller must not cancel the extraction others wait for
+        return await asyncio.shield(task)
+
+    async def extract_attachment(self, attachment: "Attachment") -> str:
+        """Download (if needed) and extract the text of an attachment."""
+
+        content = await attachment.content
+
+        if content is None:
+            raise ValueError(f"Attachment {attachment.name} has no content")
+
+        return await self.extract(base64.b64decode(content), attachment.file_type)
+
+    def close(self) -> None:
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def __aenter__(self) -> "TextExtractor":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await asyncio.to_thread(self.close)
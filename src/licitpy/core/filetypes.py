@@ -0,0 +1,73 @@
+from licitpy.core.enums import FileType
+
+# Bytes needed by libmagic to tell most document formats apart
+SNIFF_BYTES = 2048
+
+MIME_TYPES: dict[str, FileType] = {
+    "application/pdf": FileType.PDF,
+    "application/msword": FileType.DOC,
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": FileType.DOCX,
+    "application/vnd.ms-excel": FileType.XLS,
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": FileType.XLSX,
+    "application/vnd.oasis.opendocument.text": FileType.ODT,
+    "application/vnd.google-earth.kmz": FileType.KMZ,
+    "application/zip": FileType.ZIP,
+    "application/x-rar": FileType.RAR,
+    "application/x-rar-compressed": FileType.RAR,
+    "application/vnd.rar": FileType.RAR,
+    "application/rtf": FileType.RTF,
+    "text/rtf": FileType.RTF,
+    "image/jpeg": FileType.JPG,
+    "image/png": FileType.PNG,
+    "image/vnd.dwg": FileType.DWG,
+    "image/x-dwg": FileType.DWG,
+    "application/acad": FileType.DWG,
+}
+
+# Formats that share a container, where the extension tells them apart better
+# than the first bytes do (eg: a DOCX is sniffed as a plain ZIP when its
+# first member is not [Content_Types].xml).
+_CONTAINERS: dict[FileType, set[FileType]] = {
+    FileType.ZIP: {FileType.DOCX, FileType.XLSX, FileType.ODT, FileType.KMZ},
+    FileType.DOC: {FileType.XLS},
+    FileType.XLS: {FileType.DOC},
+    FileType.JPG: {FileType.JPEG},
+}
+
+
+def file_type_from_name(name: str) -> FileType:
+    """File type from the extension of `name`, UNKNOWN if it is not supported."""
+
+    extension = name.rsplit(".", 1)[-1].lower().strip() if "." in name else ""
+
+    try:
+        return FileType(extension)
+    except ValueError:
+        return FileType.UNKNOWN
+
+
+def sniff_file_type(head: bytes, name: str | None = None) -> FileType:
+    """
+    Detect the file type from the first bytes of the content.
+
+    `head` should hold at least `SNIFF_BYTES` bytes when available. The file
+    name is used to refine container formats and as a fallback when the
+    content is not recognized.
+    """
+
+    import magic
+
+    from_name = file_type_from_name(name) if name else FileType.UNKNOWN
+
+    if not head:
+        return from_name
+
+    sniffed = MIME_TYPES.get(magic.from_buffer(head, mime=True))
+
+    if sniffed is None:
+        return from_name
+
+    if from_name in _CONTAINERS.get(sniffed, ()):
+        return from_name
+
+    return sniffed
@@ -0,0 +1,398 @@
+import asyncio
+import hashlib
+import json
+import threading
+from enum import Enum
+from pathlib import Path
+from typing import Any, Mapping
+from urllib.parse import urlencode
+
+from aiohttp import (
+    ClientConnectionError,
+    ClientError,
+    ClientHandlerType,
+    ClientRequest,
+    ClientResponse,
+    ClientSession,
+    web,
+)
+from multidict import CIMultiDict
+
+from licitpy.core.exceptions import FixtureNotFoundError
+
+# Form fields whose values change on every request (the ASP.NET view state and
+# the random click coordinates of the attachment download button). They are
+# left out of the request key so replays match the recorded POST.
+VOLATILE_FIELD_NAMES = {"__VIEWSTATE"}
+VOLATILE_FIELD_SUFFIXES = (".x", ".y")
+
+# Set by the client on every request sent to the fixture server
+ORIGINAL_URL_HEADER = "X-Licitpy-Fixture-Url"
+
+# Set by the fixture server when it has no response to give
+MISSING_HEADER = "X-Licitpy-Fixture-Missing"
+UPSTREAM_ERROR_HEADER = "X-Licitpy-Fixture-Error"
+
+# Headers that describe one transfer, not the recorded content. Bodies are
+# stored decoded, so their original encoding and length no longer apply.
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "content-encoding",
+    "content-length",
+    "host",
+    "keep-alive",
+    "transfer-encoding",
+    ORIGINAL_URL_HEADER.lower(),
+}
+
+CHUNK_SIZE = 2**16
+
+
+class FixtureMode(Enum):
+    RECORD = "record"
+    REPLAY = "replay"
+
+
+def request_key(method: str, url: str, data: Any = None) -> str:
+    """Build the archive key that identifies a request."""
+
+    key = f"{method.upper()} {url}"
+
+    if data is None:
+        return key
+
+    if isinstance(data, Mapping):
+        fields = sorted(
+            (
+                name,
+                (
+                    "*"
+                    if name in VOLATILE_FIELD_NAMES
+                    or name.endswith(VOLATILE_FIELD_SUFFIXES)
+                    else str(value)
+                ),
+            )
+            for name, value in data.items()
+        )
+
+        return f"{key} {urlencode(fields)}"
+
+    if isinstance(data, bytes):
+        return f"{key} sha256={hashlib.sha256(data).hexdigest()}"
+
+    return f"{key} {data}"
+
+
+class HttpArchive:
+    """
+    Request/response pairs stored on disk.
+
+    <path>/index.jsonl   one JSON entry per recorded response
+    <path>/bodies/<sha>  response bodies, deduplicated by content hash
+
+    A request recorded several times is replayed in the recorded order,
+    starting over once every response has been served.
+
+    Loading, `add` and `read_body` do blocking file I/O, run them in a thread
+    from async code.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.index_path = self.path / "index.jsonl"
+        self.bodies_path = self.path / "bodies"
+
+        self._entries: dict[str, list[dict[str, Any]]] = {}
+        self._cursor: dict[str, int] = {}
+        self._write_lock = threading.Lock()
+
+        if self.index_path.exists():
+            with self.index_path.open("r", encoding="utf-8") as index:
+                for line in index:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries.setdefault(entry["key"], []).append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def add(
+        self,
+        key: str,
+        method: str,
+        url: str,
+        status: int,
+        headers: list[tuple[str, str]],
+        body: bytes,
+    ) -> dict[str, Any]:
+        digest = hashlib.sha256(body).hexdigest()
+
+        entry: dict[str, Any] = {
+            "key": key,
+            "method": method,
+            "url": url,
+            "status": status,
+            "headers": headers,
+            "body": digest,
+        }
+
+        with self._write_lock:
+            self.bodies_path.mkdir(parents=True, exist_ok=True)
+            body_path = self.bodies_path / digest
+
+            if not body_path.exists():
+                body_path.write_bytes(body)
+
+            with self.index_path.open("a", encoding="utf-8") as index:
+                index.write(json.dumps(entry) + "\n")
+
+            self._entries.setdefault(key, []).append(entry)
+
+        return entry
+
+    def next(self, key: str) -> dict[str, Any]:
+        """The next recorded response of `key`, without its body."""
+
+        entries = self._entries.get(key)
+
+        if not entries:
+            raise FixtureNotFoundError(f"No recorded response for: {key}")
+
+        cursor = self._cursor.get(key, 0)
+        self._cursor[key] = (cursor + 1) % len(entries)
+
+        return entries[cursor]
+
+    def read_body(self, entry: dict[str, Any]) -> bytes:
+        return (self.bodies_path / entry["body"]).read_bytes()
+
+
+class FixtureServer:
+    """
+    Local aiohttp server standing in for the real portals.
+
+    Sessions created by `create_session` send every request to this server,
+    with its original URL in a header. In replay mode it answers from the
+    archive, with the configured latency and bandwidth. In record mode it
+    forwards the request to the original URL, without following redirects,
+    and stores the response before sending it back.
+    """
+
+    def __init__(
+        self,
+        archive: HttpArchive,
+        mode: FixtureMode,
+        latency: float = 0.0,
+        bandwidth: int | None = None,
+    ) -> None:
+        self.archive = archive
+        self.mode = mode
+        self.latency = latency
+        self.bandwidth = bandwidth
+
+        self.host = "127.0.0.1"
+        self.port: int | None = None
+
+        self._runner: web.AppRunner | None = None
+        self._upstream: ClientSession | None = None
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_route("*", "/{path:.*}", self._handle)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+
+        # Port 0 lets the OS pick a free port
+        await web.TCPSite(self._runner, self.host, 0).start()
+        self.port = self._runner.addresses[0][1]
+
+        if self.mode is FixtureMode.RECORD:
+            self._upstream = ClientSession()
+
+    async def close(self) -> None:
+        if self._upstream is not None:
+            await self._upstream.close()
+            self._upstream = None
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def create_session(self, **kwargs: Any) -> ClientSession:
+        """A `ClientSession` whose requests are all served by this server."""
+        return ClientSession(middlewares=(self._redirect,), **kwargs)
+
+    async def _redirect(
+        self, request: ClientRequest, handler: ClientHandlerType
+    ) -> ClientResponse:
+        # The Host header still names the original host
+        request.headers[ORIGINAL_URL_HEADER] = str(request.url)
+        request.url = (
+            request.url.with_scheme("http").with_host(self.host).with_port(self.port)
+        )
+
+        response = await handler(request)
+
+        if MISSING_HEADER in response.headers:
+            response.release()
+            raise FixtureNotFoundError(
+                f"No recorded response for: {response.headers[MISSING_HEADER]}"
+            )
+
+        if UPSTREAM_ERROR_HEADER in response.headers:
+            response.release()
+            raise ClientConnectionError(response.headers[UPSTREAM_ERROR_HEADER])
+
+        return response
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        url = request.headers.get(ORIGINAL_URL_HEADER)
+
+        if url is None:
+            return web.Response(status=400, text="Not a fixture request.")
+
+        body = await request.read()
+
+        # Form posts are keyed by their fields, like the client-side data dict
+        data: Any = None
+
+        if request.content_type == "application/x-www-form-urlencoded":
+            data = await request.post()
+        elif body:
+            data = body
+
+        key = request_key(request.method, url, data)
+
+        try:
+            if self.mode is FixtureMode.RECORD:
+                entry, content = await self._record(request, url, key, body)
+            else:
+                entry = self.archive.next(key)
+                content = await asyncio.to_thread(self.archive.read_body, entry)
+        except FixtureNotFoundError:
+            return web.Response(status=404, headers={MISSING_HEADER: key})
+        except ClientError as e:
+            return web.Response(status=502, headers={UPSTREAM_ERROR_HEADER: repr(e)})
+
+        return await self._respond(request, entry, content)
+
+    async def _record(
+        self, request: web.Request, url: str, key: str, body: bytes
+    ) -> tuple[dict[str, Any], bytes]:
+        assert self._upstream is not None
+
+        headers = CIMultiDict(
+            (name, value)
+            for name, value in request.headers.items()
+            if name.lower() not in HOP_BY_HOP_HEADERS
+        )
+
+        async with self._upstream.request(
+            request.method,
+            url,
+            headers=headers,
+            data=body or None,
+            allow_redirects=False,
+        ) as response:
+            content = await response.read()
+
+        entry = await asyncio.to_thread(
+            self.archive.add,
+            key=key,
+            method=request.method,
+            url=url,
+            status=response.status,
+            headers=list(response.headers.items()),
+            body=content,
+        )
+
+        return entry, content
+
+    async def _respond(
+        self, request: web.Request, entry: dict[str, Any], content: bytes
+    ) -> web.StreamResponse:
+        replaying = self.mode is FixtureMode.REPLAY
+
+        if replaying and self.latency > 0:
+            await asyncio.sleep(self.latency)
+
+        response = web.StreamResponse(
+            status=entry["status"],
+            headers=CIMultiDict(
+                (name, value)
+                for name, value in entry["headers"]
+                if name.lower() not in HOP_BY_HOP_HEADERS
+            ),
+        )
+        response.content_length = len(content)
+
+        await response.prepare(request)
+
+        if request.method != "HEAD":
+            for start in range(0, len(content), CHUNK_SIZE):
+                chunk = content[start : start + CHUNK_SIZE]
+
+                if replaying and self.bandwidth:
+                    await asyncio.sleep(len(chunk) / self.bandwidth)
+
+                await response.write(chunk)
+
+        await response.write_eof()
+
+        return response
+
+
+class HttpFixtures:
+    """
+    Record/replay configuration for `AsyncHttpClient`.
+
+    # Capture real traffic (including HEAD redirects and the VIEWSTATE POST flow)
+    async with Licitpy(fixtures=HttpFixtures.record("fixtures/cl")) as client:
+        ...
+
+    # Serve it back offline, simulating 50 ms latency and 2 MB/s per response
+    fixtures = HttpFixtures.replay("fixtures/cl", latency=0.05, bandwidth=2_000_000)
+    async with Licitpy(fixtures=fixtures) as client:
+        ...
+
+    Both go through a local `FixtureServer`, started when the client opens.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        mode: FixtureMode,
+        latency: float = 0.0,
+        bandwidth: int | None = None,
+    ) -> None:
+        if latency < 0:
+            raise ValueError("latency cannot be negative.")
+
+        if bandwidth is not None and bandwidth <= 0:
+            raise ValueError("bandwidth must be a positive number of bytes per second.")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency
+        self.bandwidth = bandwidth
+
+    @classmethod
+    def record(cls, path: str | Path) -> "HttpFixtures":
+        return cls(path, FixtureMode.RECORD)
+
+    @classmethod
+    def replay(
+        cls, path: str | Path, latency: float = 0.0, bandwidth: int | None = None
+    ) -> "HttpFixtures":
+        return cls(path, FixtureMode.REPLAY, latency=latency, bandwidth=bandwidth)
+
+    async def start_server(self) -> FixtureServer:
+        # The archive is read when the server starts, so it includes anything
+        # recorded after this object was created.
+        archive = await asyncio.to_thread(HttpArchive, self.path)
+
+        server = FixtureServer(archive, self.mode, self.latency, self.bandwidth)
+        await server.start()
+
+        return server
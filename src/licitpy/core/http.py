@@ -1,16 +1,138 @@
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, TypeVar
+from urllib.parse import urlsplit
 
-import aiofiles
-from aiohttp import ClientSession
-from aiohttp_client_cache import CachedSession, SQLiteBackend
+from licitpy.core.exceptions import CircuitOpenError
+from licitpy.core.metrics import (
+    HTTP_CACHE_HITS,
+    HTTP_CACHE_MISSES,
+    HTTP_CIRCUIT_REJECTIONS,
+    HTTP_HEDGES,
+    HTTP_REQUESTS,
+    HTTP_RESPONSE_BYTES,
+    Metrics,
+)
+
+if TYPE_CHECKING:
+    from aiohttp import ClientResponse, ClientSession, TCPConnector
+    from aiohttp_client_cache import CachedSession
+
+    from licitpy.core.cache import SharedSQLiteBackend, SingleFlight
+    from licitpy.core.concurrency import RateLimiter
+    from licitpy.core.fixtures import FixtureServer, HttpFixtures
+    from licitpy.core.resilience import (
+        CircuitBreaker,
+        CircuitBreakerPolicy,
+        HedgePolicy,
+        Hedger,
+    )
+
+# aiohttp and aiohttp_client_cache (which imports every cache backend) are
+# imported on first use, so `import licitpy` stays cheap for short-lived jobs.
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ConnectionSettings:
+    """
+    Connection pool and transfer settings for `AsyncHttpClient`.
+
+    The defaults are sized for bulk crawling of a single portal: enough
+    connections per host to keep large `gather` batches busy, idle
+    connections kept around between batches and DNS answers cached.
+
+    Attributes:
+        limit: Maximum number of simultaneous connections.
+        limit_per_host: Maximum simultaneous connections to the same host (0 = no limit).
+        keepalive_timeout: Seconds an idle connection is kept for reuse.
+        use_dns_cache: Cache DNS resolutions.
+        ttl_dns_cache: Seconds a DNS resolution is cached (None = forever).
+        happy_eyeballs_delay: Delay before trying the next address (RFC 8305), None disables it.
+        compression: True lets aiohttp offer every encoding it can decode (gzip,
+            deflate, and brotli/zstd when their packages are installed). False
+            sends "Accept-Encoding: identity" to ask for uncompressed responses.
+    """
+
+    limit: int = 256
+    limit_per_host: int = 128
+    keepalive_timeout: float = 60.0
+    use_dns_cache: bool = True
+    ttl_dns_cache: int | None = 600
+    happy_eyeballs_delay: float | None = 0.25
+    compression: bool = True
+
+    def create_connector(self) -> "TCPConnector":
+        from aiohttp import TCPConnector
+
+        return TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=self.use_dns_cache,
+            ttl_dns_cache=self.ttl_dns_cache,
+            happy_eyeballs_delay=self.happy_eyeballs_delay,
+        )
+
+
+@dataclass(frozen=True)
+class SharedCacheSettings:
+    """
+    HTTP cache shared by several processes on one machine, eg: crawler workers.
+
+    The SQLite database runs in WAL mode with batched writes, and a URL
+    missing from the cache is fetched by a single process at a time: the
+    others wait for it and are then served from the cache.
+
+    Attributes:
+        path: SQLite database, shared by every process using the same path.
+        batch_size: Buffered writes that trigger a commit.
+        commit_interval: Seconds a write may stay buffered before it is committed.
+        busy_timeout: Seconds to wait for another process to release the database.
+        lock_timeout: Seconds to wait for another process fetching the same URL.
+        lock_stripes: Number of URL locks, URLs are hashed onto them.
+    """
+
+    path: str = "licitpy_async.sqlite"
+    batch_size: int = 100
+    commit_interval: float = 0.05
+    busy_timeout: float = 30.0
+    lock_timeout: float = 60.0
+    lock_stripes: int = 4096
+
+    def __post_init__(self) -> None:
+        if self.batch_size <= 0:
+            raise ValueError("batch_size must be a positive integer.")
+
+        if self.lock_stripes <= 0:
+            raise ValueError("lock_stripes must be a positive integer.")
+
+    @property
+    def lock_path(self) -> str:
+        return f"{self.path}.lock"
 
 
 class AsyncHttpClient:
     """Handles asynchronous HTTP requests with optional caching."""
 
     def __init__(
-        self, use_cache: bool = True, cache_expire_after: timedelta = timedelta(hours=1)
+        self,
+        use_cache: bool = True,
+        cache_expire_after: timedelta = timedelta(hours=1),
+        metrics: Metrics | None = None,
+        fixtures: "HttpFixtures | None" = None,
+        connection: ConnectionSettings | None = None,
+        hedging: "HedgePolicy | None" = None,
+        circuit_breaker: "CircuitBreakerPolicy | None" = None,
+        rate_limit: float | None = None,
+        shared_cache: SharedCacheSettings | None = None,
     ) -> None:
         """
         Initialize configuration but don't create the session yet.
@@ -19,19 +141,55 @@ class AsyncHttpClient:
         using async methods, as they often require event loop integration.
         The actual session is created in the open() method.
         """
-        self._session: ClientSession | CachedSession | None = None
+        self._session: "ClientSession | CachedSession | None" = None
 
         self._is_open: bool = False
         self._use_cache = use_cache
         self._cache_expire_after = cache_expire_after
 
+        # Multi-process cache, only used when caching is enabled
+        self.shared_cache = shared_cache if use_cache else None
+        self._cache_backend: "SharedSQLiteBackend | None" = None
+        self._single_flight: "SingleFlight | None" = None
+
+        self.metrics = metrics or Metrics()
+
+        # Record/replay mode, see licitpy.core.fixtures
+        self._fixtures = fixtures
+        self._fixture_server: "FixtureServer | None" = None
+
+        self.connection = connection or ConnectionSettings()
+
+        # Opt-in tail latency and outage handling, see licitpy.core.resilience
+        self._hedger: "Hedger | None" = None
+        self._circuit_breaker = circuit_breaker
+        self._breakers: dict[str, "CircuitBreaker"] = {}
+
+        if hedging is not None:
+            from licitpy.core.resilience import Hedger
+
+            self._hedger = Hedger(hedging)
+
+        # Maximum requests per second, shared by every request of this client
+        self._rate_limiter: "RateLimiter | None" = None
+
+        if rate_limit is not None:
+            from licitpy.core.concurrency import RateLimiter
+
+            self._rate_limiter = RateLimiter(rate_limit)
+
         self.headers = {
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
             "Accept-Language": "en,es-ES;q=0.9,es;q=0.8",
-            "Connection": "keep-alive",
             "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36",
         }
 
+        # HTTP/1.1 connections are persistent by default, reuse is handled by the connector
+
+        # Without the header, aiohttp negotiates the encodings it can decode
+        if not self.connection.compression:
+            self.headers["Accept-Encoding"] = "identity"
+
     async def open(self) -> None:
         """
         Initializes the async session if it is not already open.
@@ -46,22 +204,58 @@ class AsyncHttpClient:
             return
 
         # Create the appropriate session based on config
-        if self._use_cache:
+        if self._fixtures is not None:
+            # Fixture sessions bypass the cache: recording must capture real
+            # traffic and replaying never touches the network.
+            self._fixture_server = await self._fixtures.start_server()
+            self._session = self._fixture_server.create_session(
+                headers=self.headers, connector=self.connection.create_connector()
+            )
+
+        elif self.shared_cache is not None:
+            from aiohttp_client_cache import CachedSession
+
+            from licitpy.core.cache import SharedSQLiteBackend, SingleFlight
+
+            settings = self.shared_cache
+
+            self._single_flight = SingleFlight(
+                settings.lock_path, settings.lock_stripes, settings.lock_timeout
+            )
+            self._cache_backend = SharedSQLiteBackend(
+                settings, expire_after=self._cache_expire_after
+            )
+
+            self._session = CachedSession(
+                cache=self._cache_backend,
+                headers=self.headers,
+                allowed_codes=[200],
+                connector=self.connection.create_connector(),
+            )
+
+        elif self._use_cache:
+            from aiohttp_client_cache import CachedSession, SQLiteBackend
+
             self._session = CachedSession(
                 cache=SQLiteBackend(
                     cache_name="licitpy_async", expire_after=self._cache_expire_after
                 ),
                 headers=self.headers,
                 allowed_codes=[200],
+                connector=self.connection.create_connector(),
             )
         else:
-            self._session = ClientSession(headers=self.headers)
+            from aiohttp import ClientSession
+
+            self._session = ClientSession(
+                headers=self.headers, connector=self.connection.create_connector()
+            )
 
         # Mark as open
         self._is_open = True
 
     @property
-    def session(self) -> ClientSession | CachedSession:
+    def session(self) -> "ClientSession | CachedSession":
         """Returns the active async session, raising an error if not open."""
         if not self._is_open or self._session is None:
             raise RuntimeError(
@@ -73,13 +267,224 @@ class AsyncHttpClient:
 
     async def close(self) -> None:
         """Closes the async session if it exists and is open."""
+        for breaker in self._breakers.values():
+            breaker.close()
+
         if self._session and not self._session.closed:
+            # Closing the session flushes the writes buffered by a shared cache
             await self._session.close()
             self._is_open = False
 
+        if self._single_flight is not None:
+            self._single_flight.close()
+
+        if self._fixture_server is not None:
+            await self._fixture_server.close()
+            self._fixture_server = None
+
+    def record_response(
+        self, method: str, response: "ClientResponse", size: int = 0
+    ) -> None:
+        """Record request, transferred bytes and cache metrics for a response."""
+
+        self.metrics.increment(
+            HTTP_REQUESTS, labels={"method": method, "status": str(response.status)}
+        )
+
+        # CachedResponse sets from_cache, plain aiohttp responses don't have it
+        if getattr(response, "from_cache", False):
+            self.metrics.increment(HTTP_CACHE_HITS)
+            return
+
+        if self._use_cache:
+            self.metrics.increment(HTTP_CACHE_MISSES)
+
+        if size:
+            self.metrics.increment(HTTP_RESPONSE_BYTES, size)
+
+    async def throttle(self) -> None:
+        """Wait until the rate limit, if any, allows one more request."""
+
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire()
+
+    async def _is_cached(self, method: str, url: str) -> bool:
+        """Whether the session would answer the request from its cache."""
+
+        # Only CachedSession has a cache, plain and fixture sessions don't
+        cache = getattr(self.session, "cache", None)
+
+        if cache is None:
+            return False
+
+        return await cache.get_response(cache.create_key(method, url)) is not None
+
+    def _get_breaker(self, url: str) -> "CircuitBreaker | None":
+        if self._circuit_breaker is None:
+            return None
+
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+
+        breaker = self._breakers.get(origin)
+
+        if breaker is None:
+            from licitpy.core.resilience import CircuitBreaker
+
+            breaker = CircuitBreaker(
+                origin,
+                self._circuit_breaker,
+                partial(self._circuit_breaker.probe or self._probe, origin),
+            )
+            self._breakers[origin] = breaker
+
+        return breaker
+
+    async def _probe(self, origin: str) -> bool:
+        """Default circuit breaker probe: the root of `origin` answers below 500."""
+
+        async with self.session.head(
+            f"{origin}/", allow_redirects=False, timeout=10
+        ) as response:
+            return response.status < 500
+
+    @asynccontextmanager
+    async def _fetching(self, url: str) -> AsyncIterator[None]:
+        """
+        With a shared cache, wait until no other task or process is fetching
+        `url`, and keep it to ourselves until the response is committed.
+        """
+
+        if self._single_flight is None or self._cache_backend is None:
+            yield
+            return
+
+        async with self._single_flight.hold(url):
+            yield
+
+            try:
+                await self._cache_backend.flush()
+            except Exception as e:
+                # The response is still good, other processes only fetch it again
+                logger.warning("Could not save to the shared cache: %r", e)
+
+    async def _send(
+        self,
+        url: str,
+        fn: Callable[[], Awaitable[T]],
+        get_status: Callable[[T], int],
+        hedge: bool = True,
+        discard: Callable[[T], None] | None = None,
+        method: str = "GET",
+    ) -> T:
+        """
+        Run a request through the circuit breaker, the rate limit and, if
+        `hedge` is set and hedging is enabled, the hedger. `fn` must be
+        idempotent when hedged, `discard` frees the result of the losing
+        attempt.
+
+        Responses the cache holds are returned right away. Misses take the
+        shared cache lock of `url`, if any, and every attempt, hedged ones
+        included, waits for the rate limit.
+        """
+
+        breaker = self._get_breaker(url)
+
+        if breaker is not None:
+            try:
+                breaker.check()
+            except CircuitOpenError:
+                self.metrics.increment(HTTP_CIRCUIT_REJECTIONS)
+                raise
+
+        # Without a rate limit or a shared cache, hits and misses go the same way
+        coordinated = self._rate_limiter is not None or self._single_flight is not None
+        cached = coordinated and await self._is_cached(method, url)
+
+        try:
+            if cached:
+                result = await self._dispatch(url, fn, hedge, discard)
+            else:
+                async with self._fetching(url):
+                    # Another process may have fetched it while we waited
+                    if self._single_flight is not None:
+                        cached = await self._is_cached(method, url)
+
+                    throttled = self._rate_limiter is not None and not cached
+
+                    result = await self._dispatch(url, fn, hedge, discard, throttled)
+
+        except Exception:
+            if breaker is not None:
+                breaker.record_failure()
+
+            raise
+
+        if breaker is not None:
+            if get_status(result) >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+        return result
+
+    async def _dispatch(
+        self,
+        url: str,
+        fn: Callable[[], Awaitable[T]],
+        hedge: bool,
+        discard: Callable[[T], None] | None,
+        throttled: bool = False,
+    ) -> T:
+        wait = self.throttle if throttled else None
+
+        if hedge and self._hedger is not None:
+            # Every attempt waits for the rate limit, outside of its timing
+            return await self._hedger.run(
+                urlsplit(url).netloc,
+                fn,
+                on_hedge=lambda: self.metrics.increment(HTTP_HEDGES),
+                on_discard=discard,
+                wait=wait,
+            )
+
+        if wait is not None:
+            await wait()
+
+        return await fn()
+
+    async def head(self, url: str, **kwargs: Any) -> "ClientResponse":
+        async def fetch() -> "ClientResponse":
+            with self.metrics.in_flight():
+                return await self.session.head(url, **kwargs)
+
+        # The body is not read, a losing hedged response must give its connection back
+        response = await self._send(
+            url,
+            fetch,
+            lambda response: response.status,
+            discard=lambda response: response.release(),
+            method="HEAD",
+        )
+
+        self.record_response("HEAD", response)
+
+        return response
+
     async def get_html_by_url(self, url: str) -> str:
-        async with self.session.get(url) as response:
-            return await response.text()
+        async def fetch() -> tuple["ClientResponse", bytes, str]:
+            with self.metrics.in_flight():
+                async with self.session.get(url) as response:
+                    body = await response.read()
+                    return response, body, await response.text()
+
+        response, body, html = await self._send(
+            url, fetch, lambda result: result[0].status
+        )
+
+        self.record_response("GET", response, len(body))
+
+        return html
 
     async def download_file(
         self, url: str, file_name: str
@@ -89,6 +494,8 @@ class AsyncHttpClient:
         Returns the path to the downloaded file.
         """
 
+        import aiofiles
+
         # Defines the download directory relative to the current directory
         download_dir = Path.cwd() / "downloads/eu"
         download_dir.mkdir(parents=True, exist_ok=True)
@@ -96,13 +503,24 @@ class AsyncHttpClient:
         # Define the full file path
         file_path = download_dir / file_name
 
-        async with self.session.get(url) as response:
-            if response.status != 200:
-                raise Exception(f"Failed to download file: {response.status}")
+        async def fetch() -> tuple["ClientResponse", bytes]:
+            with self.metrics.in_flight():
+                async with self.session.get(url) as response:
+                    return response, await response.read()
+
+        # Bulk files are large, so they are never hedged
+        response, content = await self._send(
+            url, fetch, lambda result: result[0].status, hedge=False
+        )
+
+        # Failed downloads are counted too, with their status
+        self.record_response("GET", response, len(content))
+
+        if response.status != 200:
+            raise Exception(f"Failed to download file: {response.status}")
 
-            async with aiofiles.open(file_path, "wb") as f:
-                content = await response.read()
-                await f.write(content)
+        async with aiofiles.open(file_path, "wb") as f:
+            await f.write(content)
 
         return {
             "file_name": file_name,
@@ -0,0 +1,295 @@
+import bisect
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Mapping
+
+Labels = tuple[tuple[str, str], ...]
+
+# Upper bounds (in seconds) of the stage duration histogram buckets
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+# Histograms
+STAGE_DURATION = "stage_duration_seconds"
+
+# Counters
+HTTP_REQUESTS = "http_requests_total"
+HTTP_RESPONSE_BYTES = "http_response_bytes_total"
+HTTP_CACHE_HITS = "http_cache_hits_total"
+HTTP_CACHE_MISSES = "http_cache_misses_total"
+HTTP_HEDGES = "http_hedged_requests_total"
+HTTP_CIRCUIT_REJECTIONS = "http_circuit_rejections_total"
+
+# Gauges
+HTTP_IN_FLIGHT = "http_in_flight_requests"
+
+
+def to_labels(labels: Mapping[str, str] | None) -> Labels:
+    if not labels:
+        return ()
+
+    return tuple(sorted(labels.items()))
+
+
+class MetricsHook(ABC):
+    """
+    Receives every metric event emitted by licitpy.
+
+    Implement this to forward metrics to your own monitoring system and
+    register it with `Metrics.add_hook`.
+    """
+
+    @abstractmethod
+    def observe(self, name: str, value: float, labels: Labels = ()) -> None:
+        """Record a sample in a histogram."""
+
+    @abstractmethod
+    def increment(self, name: str, value: float = 1, labels: Labels = ()) -> None:
+        """Increase a counter."""
+
+    @abstractmethod
+    def set_gauge(self, name: str, value: float, labels: Labels = ()) -> None:
+        """Set the current value of a gauge."""
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """(upper bound, cumulative count) pairs, ending with +Inf."""
+
+        total = 0
+        result: list[tuple[float, int]] = []
+
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            total += count
+            result.append((bound, total))
+
+        return result
+
+
+class MetricsRegistry(MetricsHook):
+    """In-memory store of histograms, counters and gauges."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+
+        self.histograms: dict[tuple[str, Labels], Histogram] = {}
+        self.counters: dict[tuple[str, Labels], float] = {}
+        self.gauges: dict[tuple[str, Labels], float] = {}
+
+    def observe(self, name: str, value: float, labels: Labels = ()) -> None:
+        key = (name, labels)
+        histogram = self.histograms.get(key)
+
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(self.buckets)
+
+        histogram.observe(value)
+
+    def increment(self, name: str, value: float = 1, labels: Labels = ()) -> None:
+        key = (name, labels)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, labels: Labels = ()) -> None:
+        self.gauges[(name, labels)] = value
+
+    def counter(self, name: str, **labels: str) -> float:
+        return self.counters.get((name, to_labels(labels)), 0)
+
+    def histogram(self, name: str, **labels: str) -> Histogram | None:
+        return self.histograms.get((name, to_labels(labels)))
+
+
+# Registries of the `Metrics.batch()` blocks active in the current context.
+# Tasks copy the context when created, so work started inside the block
+# (e.g. with asyncio.gather) reports to the batch as well.
+_batch_scopes: ContextVar[tuple[MetricsRegistry, ...]] = ContextVar(
+    "licitpy_metrics_batch_scopes", default=()
+)
+
+
+class Metrics:
+    """
+    Entry point used by licitpy to emit metrics.
+
+    Every event goes to `registry`, to the hooks added with `add_hook` and to
+    the registries of the active `batch()` blocks.
+
+    async with Licitpy() as client:
+        with client.metrics.batch() as batch:
+            await asyncio.gather(*[client.cl.get_by_code(code) for code in codes])
+
+        print(PrometheusExporter().render(batch))
+    """
+
+    def __init__(self, registry: MetricsRegistry | None = None) -> None:
+        self.registry = registry or MetricsRegistry()
+        self._hooks: list[MetricsHook] = [self.registry]
+        self._in_flight = 0
+
+    def add_hook(self, hook: MetricsHook) -> None:
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: MetricsHook) -> None:
+        self._hooks.remove(hook)
+
+    def _targets(self) -> tuple[MetricsHook, ...]:
+        return (*self._hooks, *_batch_scopes.get())
+
+    def observe(
+        self, name: str, value: float, labels: Mapping[str, str] | None = None
+    ) -> None:
+        key = to_labels(labels)
+
+        for hook in self._targets():
+            hook.observe(name, value, key)
+
+    def increment(
+        self, name: str, value: float = 1, labels: Mapping[str, str] | None = None
+    ) -> None:
+        key = to_labels(labels)
+
+        for hook in self._targets():
+            hook.increment(name, value, key)
+
+    def set_gauge(
+        self, name: str, value: float, labels: Mapping[str, str] | None = None
+    ) -> None:
+        key = to_labels(labels)
+
+        for hook in self._targets():
+            hook.set_gauge(name, value, key)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one sample of the `name` stage."""
+
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.observe(STAGE_DURATION, time.perf_counter() - start, {"stage": name})
+
+    @contextmanager
+    def in_flight(self) -> Iterator[None]:
+        """Count the enclosed block as one in-flight HTTP request."""
+
+        self._in_flight += 1
+        self.set_gauge(HTTP_IN_FLIGHT, self._in_flight)
+
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self.set_gauge(HTTP_IN_FLIGHT, self._in_flight)
+
+    @contextmanager
+    def batch(self) -> Iterator[MetricsRegistry]:
+        """Collect the metrics emitted inside the block in a separate registry."""
+
+        registry = MetricsRegistry(self.registry.buckets)
+        token = _batch_scopes.set((*_batch_scopes.get(), registry))
+
+        try:
+            yield registry
+        finally:
+            _batch_scopes.reset(token)
+
+
+class PrometheusExporter:
+    """Renders a `MetricsRegistry` in the Prometheus text exposition format."""
+
+    def __init__(self, namespace: str = "licitpy") -> None:
+        self.namespace = namespace
+
+    def _name(self, name: str) -> str:
+        return f"{self.namespace}_{name}" if self.namespace else name
+
+    @staticmethod
+    def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+        pairs = (*labels, *extra)
+
+        if not pairs:
+            return ""
+
+        escaped = (
+            (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+            for key, value in pairs
+        )
+
+        return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+    @staticmethod
+    def _format_value(value: float) -> str:
+        if value == float("inf"):
+            return "+Inf"
+
+        return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+    def render(self, registry: MetricsRegistry) -> str:
+        lines: list[str] = []
+        declared: set[str] = set()
+
+        def declare(name: str, kind: str) -> str:
+            full_name = self._name(name)
+
+            if full_name not in declared:
+                declared.add(full_name)
+                lines.append(f"# TYPE {full_name} {kind}")
+
+            return full_name
+
+        for (name, labels), histogram in sorted(registry.histograms.items()):
+            full_name = declare(name, "histogram")
+
+            for bound, count in histogram.cumulative():
+                le = (("le", self._format_value(bound)),)
+                lines.append(
+                    f"{full_name}_bucket{self._format_labels(labels, le)} {count}"
+                )
+
+            lines.append(
+                f"{full_name}_sum{self._format_labels(labels)} {histogram.sum!r}"
+            )
+            lines.append(
+                f"{full_name}_count{self._format_labels(labels)} {histogram.count}"
+            )
+
+        for (name, labels), value in sorted(registry.counters.items()):
+            full_name = declare(name, "counter")
+            lines.append(
+                f"{full_name}{self._format_labels(labels)} {self._format_value(value)}"
+            )
+
+        for (name, labels), value in sorted(registry.gauges.items()):
+            full_name = declare(name, "gauge")
+            lines.append(
+                f"{full_name}{self._format_labels(labels)} {self._format_value(value)}"
+            )
+
+        return "\n".join(lines) + "\n"
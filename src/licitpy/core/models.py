@@ -3,6 +3,7 @@ from datetime import datetime, timezone
 from pydantic import BaseModel, HttpUrl
 
 from licitpy.core.enums import Attachment
+from licitpy.core.trusted import construct_trusted
 
 
 class Tender(BaseModel):
@@ -12,6 +13,33 @@ class Tender(BaseModel):
     attachment_url: HttpUrl
     attachments: list[Attachment]
 
+    @classmethod
+    def from_trusted(
+        cls,
+        code: str,
+        title: str,
+        closing_date: datetime,
+        attachment_url: str,
+        attachments: list[Attachment],
+    ) -> "Tender":
+        """
+        Build a tender from values already checked by our own parsers.
+
+        Skips pydantic validation of the nested attachments. Only the
+        attachment URL is wrapped so serialization keeps working.
+        """
+
+        return construct_trusted(
+            cls,
+            {
+                "code": code,
+                "title": title,
+                "closing_date": closing_date,
+                "attachment_url": HttpUrl(attachment_url),
+                "attachments": attachments,
+            },
+        )
+
     @property
     def is_open(self) -> bool:
         return datetime.now(timezone.utc) < self.closing_date
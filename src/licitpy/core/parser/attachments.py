@@ -2,7 +2,7 @@ import re
 
 from lxml.html import HtmlElement
 
-from licitpy.core.enums import Attachment, FileType
+from licitpy.core.enums import Attachment, AttachmentRecord
 from licitpy.core.exceptions import (
     AttachmentIdNotFoundError,
     AttachmentNameNotFoundError,
@@ -10,6 +10,7 @@ from licitpy.core.exceptions import (
     AttachmentTableNotFoundError,
     AttachmentTableRowsNotFoundError,
 )
+from licitpy.core.filetypes import file_type_from_name
 from licitpy.core.parser.base import BaseParser
 
 # TODO: This should go in Chile since it is exclusive to Chile.
@@ -84,15 +85,15 @@ class AttachmentParser(BaseParser):
 
         return None
 
-    def get_attachments(self, html: str) -> list[Attachment]:
+    def get_attachment_records(self, html: str) -> list[AttachmentRecord]:
         """
-        Get the attachments of a tender from the HTML content.
+        Get the attachments of a tender from the HTML content as lightweight records.
         """
 
         table = self.get_table_attachments(html)
         rows: list[HtmlElement] = self.get_table_attachments_rows(table)
 
-        attachments: list[Attachment] = []
+        records: list[AttachmentRecord] = []
 
         for tr in rows:
             td: list[HtmlElement] = tr.xpath("td")
@@ -109,20 +110,31 @@ class AttachmentParser(BaseParser):
             if not name:
                 raise AttachmentNameNotFoundError("Attachment name not found")
 
-            file_type = FileType(name.split(".")[-1].lower().strip())
-
-            attachment = Attachment(
-                **{
-                    "id": attachment_id,
-                    "name": name,
-                    "type": attachment_type,
-                    "description": description,
-                    "size": size,
-                    "upload_date": upload_date,
-                    "file_type": file_type,
-                }
+            # These were previously enforced by pydantic validation, which the
+            # trusted construction path skips.
+            if attachment_type is None or upload_date is None:
+                raise ValueError(f"Incomplete attachment row for: {name}")
+
+            # Provisional, the type is sniffed from the content once downloaded
+            file_type = file_type_from_name(name)
+
+            records.append(
+                AttachmentRecord(
+                    id=attachment_id,
+                    name=name,
+                    type=attachment_type,
+                    description=description,
+                    size=size,
+                    upload_date=upload_date,
+                    file_type=file_type,
+                )
             )
 
-            attachments.append(attachment)
+        return records
+
+    def get_attachments(self, html: str) -> list[Attachment]:
+        """
+        Get the attachments of a tender from the HTML content.
+        """
 
-        return attachments
+        return [record.to_attachment() for record in self.get_attachment_records(html)]
@@ -0,0 +1,233 @@
+import asyncio
+import inspect
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, Callable, Iterable
+
+from licitpy.core.metrics import Metrics
+
+PIPELINE_QUEUE_DEPTH = "pipeline_queue_depth"
+
+# Marks the end of the stream for one stage worker
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    """
+    One step of a `Pipeline`.
+
+    Attributes:
+        name: Stage name, used for queue depth and statistics.
+        fn: Called with each item, sync or async. Its return value is passed
+            to the next stage; returning None drops the item. The return value
+            of the last stage is ignored.
+        concurrency: Number of items processed by this stage at the same time.
+        executor: Run a sync `fn` in this executor (eg: a thread or process
+            pool for CPU-bound parsing) instead of on the event loop.
+    """
+
+    name: str
+    fn: Callable[[Any], Any]
+    concurrency: int = 1
+    executor: Executor | None = None
+
+    def __post_init__(self) -> None:
+        if self.concurrency <= 0:
+            raise ValueError(f"Stage '{self.name}' concurrency must be positive.")
+
+
+@dataclass
+class StageStats:
+    processed: int = 0
+    dropped: int = 0
+    failed: int = 0
+
+
+@dataclass
+class PipelineStats:
+    stages: dict[str, StageStats] = field(default_factory=dict)
+
+    @property
+    def completed(self) -> int:
+        """Items that made it through the last stage."""
+
+        if not self.stages:
+            return 0
+
+        return list(self.stages.values())[-1].processed
+
+
+class Pipeline:
+    """
+    Runs items through stages connected by bounded queues.
+
+    Each stage has its own workers and an input queue of at most `queue_size`
+    items. When a stage falls behind, its queue fills up and the stage before
+    it blocks on `put`, all the way back to the source, so a slow sink or
+    parser slows the crawl down instead of buffering without limit.
+
+    pipeline = Pipeline(
+        [
+            Stage("fetch", fetch, concurrency=20),
+            Stage("parse", parse, concurrency=4, executor=thread_pool),
+            Stage("sink", writer.write),
+        ],
+        queue_size=50,
+    )
+    stats = await pipeline.run(codes)
+
+    Args:
+        stages: Stages in processing order, the last one usually being the sink.
+        queue_size: Capacity of each stage's input queue.
+        metrics: Receives a `pipeline_queue_depth` gauge per stage.
+        on_error: Called with (stage name, item, exception) when a stage fails.
+            The item is skipped. Without it, the first error stops the pipeline
+            and is raised by `run`.
+    """
+
+    def __init__(
+        self,
+        stages: list[Stage],
+        queue_size: int = 100,
+        metrics: Metrics | None = None,
+        on_error: Callable[[str, Any, Exception], None] | None = None,
+    ) -> None:
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage.")
+
+        if queue_size <= 0:
+            raise ValueError("queue_size must be a positive integer.")
+
+        names = [stage.name for stage in stages]
+
+        if len(set(names)) != len(names):
+            raise ValueError("Stage names must be unique.")
+
+        self.stages = stages
+        self.queue_size = queue_size
+        self.metrics = metrics
+        self.on_error = on_error
+
+        self._queues: list[asyncio.Queue[Any]] = []
+        self._workers: list[asyncio.Future[None]] = []
+        self.stats = PipelineStats()
+
+    def depths(self) -> dict[str, int]:
+        """Current number of items waiting in front of each stage."""
+
+        return {
+            stage.name: queue.qsize() for stage, queue in zip(self.stages, self._queues)
+        }
+
+    def _report_depth(self, index: int) -> None:
+        if self.metrics is not None:
+            self.metrics.set_gauge(
+                PIPELINE_QUEUE_DEPTH,
+                self._queues[index].qsize(),
+                {"stage": self.stages[index].name},
+            )
+
+    async def _put(self, index: int, item: Any) -> None:
+        await self._queues[index].put(item)
+        self._report_depth(index)
+
+    async def _get(self, index: int) -> Any:
+        item = await self._queues[index].get()
+        self._report_depth(index)
+
+        return item
+
+    async def _call(self, stage: Stage, item: Any) -> Any:
+        if stage.executor is not None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(stage.executor, stage.fn, item)
+
+        result = stage.fn(item)
+
+        if inspect.isawaitable(result):
+            return await result
+
+        return result
+
+    async def _feed(self, source: AsyncIterable[Any] | Iterable[Any]) -> None:
+        if isinstance(source, AsyncIterable):
+            async for item in source:
+                await self._put(0, item)
+        else:
+            for item in source:
+                await self._put(0, item)
+
+        for _ in range(self.stages[0].concurrency):
+            await self._put(0, _DONE)
+
+    async def _work(self, index: int) -> None:
+        stage = self.stages[index]
+        stats = self.stats.stages[stage.name]
+        last = index == len(self.stages) - 1
+
+        while True:
+            item = await self._get(index)
+
+            if item is _DONE:
+                return
+
+            try:
+                result = await self._call(stage, item)
+            except Exception as e:
+                if self.on_error is None:
+                    raise
+
+                stats.failed += 1
+                self.on_error(stage.name, item, e)
+                continue
+
+            # The last stage is usually a sink, its return value is not used
+            if result is None and not last:
+                stats.dropped += 1
+                continue
+
+            stats.processed += 1
+
+            if not last:
+                await self._put(index + 1, result)
+
+    async def _run_stage(self, index: int) -> None:
+        workers = [
+            asyncio.ensure_future(self._work(index))
+            for _ in range(self.stages[index].concurrency)
+        ]
+        self._workers.extend(workers)
+
+        await asyncio.gather(*workers)
+
+        # Every worker of this stage is done, tell the next stage's workers
+        if index + 1 < len(self.stages):
+            for _ in range(self.stages[index + 1].concurrency):
+                await self._put(index + 1, _DONE)
+
+    async def run(self, source: AsyncIterable[Any] | Iterable[Any]) -> PipelineStats:
+        """Feed every item of `source` through the pipeline and wait until done."""
+
+        self._queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        self._workers = []
+        self.stats = PipelineStats({stage.name: StageStats() for stage in self.stages})
+
+        tasks = [asyncio.ensure_future(self._feed(source))] + [
+            asyncio.ensure_future(self._run_stage(index))
+            for index in range(len(self.stages))
+        ]
+
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # After a failure, the other workers of every stage are still
+            # blocked on their queues
+            running = [*tasks, *self._workers]
+
+            for task in running:
+                task.cancel()
+
+            await asyncio.gather(*running, return_exceptions=True)
+
+        return self.stats
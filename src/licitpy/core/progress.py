@@ -0,0 +1,198 @@
+import itertools
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from tqdm import tqdm
+
+
+@dataclass(frozen=True)
+class ProgressSnapshot:
+    """
+    Aggregated progress of every download tracked by a reporter.
+
+    Attributes:
+        active: Downloads in progress.
+        completed: Downloads finished since the reporter was created.
+        done_bytes: Bytes received, including finished downloads.
+        total_bytes: Expected bytes of the downloads started so far.
+        elapsed: Seconds since the first download started.
+    """
+
+    active: int
+    completed: int
+    done_bytes: int
+    total_bytes: int
+    elapsed: float
+
+    @property
+    def rate(self) -> float:
+        """Bytes per second since the first download started."""
+        return self.done_bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+
+ProgressCallback = Callable[[ProgressSnapshot], None]
+
+
+class ProgressReporter(ABC):
+    """
+    Receives the progress of attachment downloads.
+
+    `start` is called once per download and returns a task id, then
+    `advance` for every chunk received and `finish` when it ends (even on
+    failure). `advance` is called in the hot download loop and must be cheap.
+    """
+
+    @abstractmethod
+    def start(self, name: str, total: int) -> int:
+        """A download of `total` bytes started. Returns its task id."""
+
+    @abstractmethod
+    def advance(self, task: int, amount: int) -> None:
+        """`amount` more bytes of `task` were received."""
+
+    @abstractmethod
+    def finish(self, task: int) -> None:
+        """`task` ended."""
+
+    def close(self) -> None:
+        """Release any resource held by the reporter (eg: a terminal bar)."""
+
+
+class NullProgressReporter(ProgressReporter):
+    """Discards progress, for headless runs."""
+
+    def start(self, name: str, total: int) -> int:
+        return 0
+
+    def advance(self, task: int, amount: int) -> None:
+        pass
+
+    def finish(self, task: int) -> None:
+        pass
+
+
+class AggregateProgressReporter(ProgressReporter):
+    """
+    Aggregates every concurrent download into a single `ProgressSnapshot`.
+
+    Subscribers are called with a snapshot at most once every `interval`
+    seconds, and whenever the last active download finishes.
+
+    progress = AggregateProgressReporter(interval=1.0)
+    progress.subscribe(lambda snapshot: gauge.set(snapshot.rate))
+
+    Args:
+        interval: Minimum seconds between two notifications.
+    """
+
+    def __init__(self, interval: float = 0.5) -> None:
+        if interval < 0:
+            raise ValueError("interval cannot be negative.")
+
+        self.interval = interval
+
+        self._callbacks: list[ProgressCallback] = []
+        self._ids = itertools.count(1)
+        self._active: dict[int, str] = {}
+        self._completed = 0
+        self._done_bytes = 0
+        self._total_bytes = 0
+        self._started_at: float | None = None
+        self._next_emit = 0.0
+
+    def subscribe(self, callback: ProgressCallback) -> None:
+        self._callbacks.append(callback)
+
+    def unsubscribe(self, callback: ProgressCallback) -> None:
+        self._callbacks.remove(callback)
+
+    def snapshot(self) -> ProgressSnapshot:
+        elapsed = (
+            time.monotonic() - self._started_at if self._started_at is not None else 0
+        )
+
+        return ProgressSnapshot(
+            active=len(self._active),
+            completed=self._completed,
+            done_bytes=self._done_bytes,
+            total_bytes=self._total_bytes,
+            elapsed=elapsed,
+        )
+
+    def emit(self) -> None:
+        """Notify the subscribers now, regardless of the interval."""
+
+        self._next_emit = time.monotonic() + self.interval
+
+        if not self._callbacks:
+            return
+
+        snapshot = self.snapshot()
+
+        for callback in self._callbacks:
+            callback(snapshot)
+
+    def start(self, name: str, total: int) -> int:
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+
+        task = next(self._ids)
+
+        self._active[task] = name
+        self._total_bytes += total
+
+        return task
+
+    def advance(self, task: int, amount: int) -> None:
+        self._done_bytes += amount
+
+        if time.monotonic() >= self._next_emit:
+            self.emit()
+
+    def finish(self, task: int) -> None:
+        if self._active.pop(task, None) is None:
+            return
+
+        self._completed += 1
+
+        if not self._active or time.monotonic() >= self._next_emit:
+            self.emit()
+
+
+class TqdmProgressReporter(AggregateProgressReporter):
+    """
+    One `tqdm` bar for all concurrent downloads, refreshed every `interval` seconds.
+
+    The bar is created on the first notification and closed by `close`.
+    """
+
+    def __init__(self, interval: float = 0.5, desc: str = "Downloading") -> None:
+        super().__init__(interval)
+
+        self.desc = desc
+        self._bar: "tqdm[Any] | None" = None
+
+        self.subscribe(self._render)
+
+    def _render(self, snapshot: ProgressSnapshot) -> None:
+        bar = self._bar
+
+        if bar is None:
+            from tqdm import tqdm
+
+            # Refreshes are driven by the interval of this reporter
+            bar = self._bar = tqdm(
+                unit="B", unit_scale=True, desc=self.desc, mininterval=0
+            )
+
+        bar.total = snapshot.total_bytes
+        bar.n = snapshot.done_bytes
+        bar.set_postfix(active=snapshot.active, done=snapshot.completed)
+
+    def close(self) -> None:
+        if self._bar is not None:
+            self._bar.close()
+            self._bar = None
@@ -0,0 +1,297 @@
+import asyncio
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+
+@dataclass(frozen=True)
+class WorkItem:
+    """
+    A unit of work leased from a `WorkQueue`.
+
+    Attributes:
+        id: Queue-specific identifier of the item.
+        kind: What to do with the payload, eg: "cl.tender" or "eu.month".
+        payload: The tender code, package month, ...
+        attempts: How many times the item has been leased, including this one.
+        lease_token: Identifies this lease; acks from an expired lease are ignored.
+    """
+
+    id: int
+    kind: str
+    payload: str
+    attempts: int
+    lease_token: str
+
+
+@dataclass(frozen=True)
+class QueueStats:
+    pending: int
+    leased: int
+    done: int
+    failed: int
+    first_leased_at: float | None
+    last_done_at: float | None
+
+    @property
+    def throughput(self) -> float:
+        """Items completed per second across every worker sharing the queue."""
+
+        if not self.done or self.first_leased_at is None or self.last_done_at is None:
+            return 0.0
+
+        elapsed = self.last_done_at - self.first_leased_at
+
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+
+class WorkQueue(ABC):
+    """
+    Shared queue of work items with leases and visibility timeouts.
+
+    A leased item is invisible to other workers until it is acked, released
+    or its visibility timeout expires, so several processes or hosts can
+    share one queue without fetching the same item twice. Implement this
+    interface to plug in an external broker.
+    """
+
+    @abstractmethod
+    async def put(self, kind: str, payloads: Iterable[str]) -> int:
+        """
+        Add items. Items already done or failed are queued again with their
+        attempts reset, eg: to refresh a tender or retry after an outage.
+        Items still pending or leased are left as they are. Returns how many
+        were added or queued again.
+        """
+
+    @abstractmethod
+    async def lease(self, limit: int, visibility_timeout: float) -> list[WorkItem]:
+        """Lease up to `limit` visible items for `visibility_timeout` seconds."""
+
+    @abstractmethod
+    async def ack(self, item: WorkItem) -> bool:
+        """Mark a leased item as done. Returns False if the lease was lost."""
+
+    @abstractmethod
+    async def release(
+        self, item: WorkItem, error: str | None = None, delay: float = 0.0
+    ) -> None:
+        """
+        Give a leased item back after a failure so it can be retried, no
+        sooner than `delay` seconds from now.
+        """
+
+    @abstractmethod
+    async def extend(self, item: WorkItem, visibility_timeout: float) -> bool:
+        """Extend a lease. Returns False if the lease was lost."""
+
+    @abstractmethod
+    async def stats(self) -> QueueStats: ...
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """
+    `WorkQueue` stored in a local SQLite file, shared by every process on the host.
+
+    Items that fail `max_attempts` times are marked as failed and no longer
+    leased, until `put` queues them again. The `lease_expires` column of a released item holds when it may be
+    leased again.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS work_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            lease_token TEXT,
+            lease_expires REAL,
+            leased_at REAL,
+            done_at REAL,
+            error TEXT,
+            UNIQUE (kind, payload)
+        );
+        CREATE INDEX IF NOT EXISTS work_items_status ON work_items (status, lease_expires);
+    """
+
+    def __init__(
+        self, path: str | Path = "licitpy_queue.sqlite", max_attempts: int = 3
+    ):
+        if max_attempts <= 0:
+            raise ValueError("max_attempts must be a positive integer.")
+
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+
+        with self._connect() as connection:
+            connection.executescript(self.SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Autocommit mode, transactions are opened explicitly with BEGIN IMMEDIATE
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+
+            yield connection
+        finally:
+            connection.close()
+
+    def _put(self, kind: str, payloads: Iterable[str]) -> int:
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            cursor = connection.executemany(
+                """
+                INSERT INTO work_items (kind, payload) VALUES (?, ?)
+                ON CONFLICT (kind, payload) DO UPDATE
+                SET status = 'pending', attempts = 0, lease_token = NULL,
+                    lease_expires = NULL, leased_at = NULL, done_at = NULL,
+                    error = NULL
+                WHERE status IN ('done', 'failed')
+                """,
+                ((kind, payload) for payload in payloads),
+            )
+            connection.execute("COMMIT")
+
+            return cursor.rowcount
+
+    def _lease(self, limit: int, visibility_timeout: float) -> list[WorkItem]:
+        now = time.time()
+        token = uuid.uuid4().hex
+
+        with self._connect() as connection:
+            # BEGIN IMMEDIATE takes the write lock up front, so two workers
+            # can never select and lease the same rows.
+            connection.execute("BEGIN IMMEDIATE")
+
+            # Expired leases that used up their attempts will never be leased again
+            connection.execute(
+                """
+                UPDATE work_items SET status = 'failed', lease_token = NULL,
+                    error = COALESCE(error, 'visibility timeout expired')
+                WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?
+                """,
+                (now, self.max_attempts),
+            )
+
+            rows = connection.execute(
+                """
+                SELECT id, kind, payload, attempts FROM work_items
+                WHERE status IN ('pending', 'leased')
+                  AND (lease_expires IS NULL OR lease_expires < ?)
+                  AND attempts < ?
+                ORDER BY id
+                LIMIT ?
+                """,
+                (now, self.max_attempts, limit),
+            ).fetchall()
+
+            connection.executemany(
+                """
+                UPDATE work_items
+                SET status = 'leased', attempts = attempts + 1, lease_token = ?,
+                    lease_expires = ?, leased_at = ?
+                WHERE id = ?
+                """,
+                ((token, now + visibility_timeout, now, row[0]) for row in rows),
+            )
+
+            connection.execute("COMMIT")
+
+        return [
+            WorkItem(
+                id=row[0],
+                kind=row[1],
+                payload=row[2],
+                attempts=row[3] + 1,
+                lease_token=token,
+            )
+            for row in rows
+        ]
+
+    def _ack(self, item: WorkItem) -> bool:
+        with self._connect() as connection:
+            cursor = connection.execute(
+                """
+                UPDATE work_items SET status = 'done', done_at = ?, lease_token = NULL
+                WHERE id = ? AND status = 'leased' AND lease_token = ?
+                """,
+                (time.time(), item.id, item.lease_token),
+            )
+
+            return cursor.rowcount == 1
+
+    def _release(self, item: WorkItem, error: str | None, delay: float) -> None:
+        status = "failed" if item.attempts >= self.max_attempts else "pending"
+
+        with self._connect() as connection:
+            connection.execute(
+                """
+                UPDATE work_items
+                SET status = ?, error = ?, lease_token = NULL, lease_expires = ?
+                WHERE id = ? AND status = 'leased' AND lease_token = ?
+                """,
+                (status, error, time.time() + delay, item.id, item.lease_token),
+            )
+
+    def _extend(self, item: WorkItem, visibility_timeout: float) -> bool:
+        with self._connect() as connection:
+            cursor = connection.execute(
+                """
+                UPDATE work_items SET lease_expires = ?
+                WHERE id = ? AND status = 'leased' AND lease_token = ?
+                """,
+                (time.time() + visibility_timeout, item.id, item.lease_token),
+            )
+
+            return cursor.rowcount == 1
+
+    def _stats(self) -> QueueStats:
+        with self._connect() as connection:
+            counts = dict(
+                connection.execute(
+                    "SELECT status, COUNT(*) FROM work_items GROUP BY status"
+                ).fetchall()
+            )
+            first_leased_at, last_done_at = connection.execute(
+                "SELECT MIN(leased_at), MAX(done_at) FROM work_items"
+            ).fetchone()
+
+        return QueueStats(
+            pending=counts.get("pending", 0),
+            leased=counts.get("leased", 0),
+            done=counts.get("done", 0),
+            failed=counts.get("failed", 0),
+            first_leased_at=first_leased_at,
+            last_done_at=last_done_at,
+        )
+
+    # SQLite calls block, so they run in a thread to keep the event loop free
+
+    async def put(self, kind: str, payloads: Iterable[str]) -> int:
+        return await asyncio.to_thread(self._put, kind, list(payloads))
+
+    async def lease(self, limit: int, visibility_timeout: float) -> list[WorkItem]:
+        return await asyncio.to_thread(self._lease, limit, visibility_timeout)
+
+    async def ack(self, item: WorkItem) -> bool:
+        return await asyncio.to_thread(self._ack, item)
+
+    async def release(
+        self, item: WorkItem, error: str | None = None, delay: float = 0.0
+    ) -> None:
+        await asyncio.to_thread(self._release, item, error, delay)
+
+    async def extend(self, item: WorkItem, visibility_timeout: float) -> bool:
+        return await asyncio.to_thread(self._extend, item, visibility_timeout)
+
+    async def stats(self) -> QueueStats:
+        return await asyncio.to_thread(self._stats)
@@ -0,0 +1,286 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from functools import partial
+from typing import Awaitable, Callable, TypeVar
+
+from licitpy.core.exceptions import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """
+    When to fire a duplicate of a slow idempotent request (GET/HEAD).
+
+    The duplicate is sent once the first attempt has been running longer
+    than the `percentile` of the recent latencies of the same host, clamped
+    to [min_delay, max_delay]. The first reply wins and the other attempt is
+    cancelled. No hedging happens until `min_samples` latencies are known.
+    """
+
+    percentile: float = 0.95
+    min_delay: float = 0.05
+    max_delay: float = 10.0
+    min_samples: int = 20
+    window: int = 500
+
+    def __post_init__(self) -> None:
+        if not 0 < self.percentile < 1:
+            raise ValueError("percentile must be between 0 and 1.")
+
+        if self.min_delay > self.max_delay:
+            raise ValueError("min_delay cannot be greater than max_delay.")
+
+
+class LatencyTracker:
+    """Sliding window of request latencies for one host."""
+
+    def __init__(self, window: int) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, percentile: float) -> float:
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(percentile * len(ordered)))
+
+        return ordered[index]
+
+
+class Hedger:
+    """Runs idempotent requests with hedging according to a `HedgePolicy`."""
+
+    def __init__(self, policy: HedgePolicy) -> None:
+        self.policy = policy
+        self._latencies: dict[str, LatencyTracker] = {}
+
+    def _tracker(self, host: str) -> LatencyTracker:
+        tracker = self._latencies.get(host)
+
+        if tracker is None:
+            tracker = self._latencies[host] = LatencyTracker(self.policy.window)
+
+        return tracker
+
+    def delay(self, host: str) -> float | None:
+        """Seconds to wait before hedging a request to `host`, None to not hedge."""
+
+        tracker = self._tracker(host)
+
+        if len(tracker) < self.policy.min_samples:
+            return None
+
+        return min(
+            self.policy.max_delay,
+            max(self.policy.min_delay, tracker.percentile(self.policy.percentile)),
+        )
+
+    async def _timed(
+        self,
+        host: str,
+        fn: Callable[[], Awaitable[T]],
+        wait: Callable[[], Awaitable[None]] | None = None,
+    ) -> T:
+        # Time spent waiting for a rate limit token is not latency of the host
+        if wait is not None:
+            await wait()
+
+        start = time.perf_counter()
+        result = await fn()
+        self._tracker(host).add(time.perf_counter() - start)
+
+        return result
+
+    async def run(
+        self,
+        host: str,
+        fn: Callable[[], Awaitable[T]],
+        on_hedge: Callable[[], None] | None = None,
+        on_discard: Callable[[T], None] | None = None,
+        wait: Callable[[], Awaitable[None]] | None = None,
+    ) -> T:
+        """
+        Run `fn`, hedged once the delay of `host` has passed.
+
+        `on_discard` receives the result of an attempt that completed but
+        lost the race, eg: to release an unread response. `wait` is awaited
+        before each attempt, eg: for a rate limit, and counts neither toward
+        the latency samples nor the hedge delay.
+        """
+
+        delay = self.delay(host)
+
+        if wait is not None:
+            await wait()
+
+        if delay is None:
+            return await self._timed(host, fn)
+
+        attempts = {asyncio.ensure_future(self._timed(host, fn))}
+        winner: asyncio.Future[T] | None = None
+
+        try:
+            done, pending = await asyncio.wait(attempts, timeout=delay)
+
+            if not done:
+                if on_hedge is not None:
+                    on_hedge()
+
+                attempts.add(asyncio.ensure_future(self._timed(host, fn, wait)))
+                pending = attempts
+
+            while winner is None:
+                if not done:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+
+                succeeded = [attempt for attempt in done if attempt.exception() is None]
+
+                if succeeded:
+                    winner = succeeded[0]
+                elif not pending:
+                    # Every attempt failed, raise one of their errors
+                    winner = done.pop()
+
+                # Otherwise keep waiting for the other attempt
+                done = set()
+
+            return winner.result()
+        finally:
+            # Also reached when the caller is cancelled during either wait
+            for attempt in attempts:
+                if attempt is winner:
+                    continue
+
+                attempt.cancel()
+                attempt.add_done_callback(partial(_discard, on_discard))
+
+
+def _discard(
+    on_discard: Callable[[T], None] | None, attempt: "asyncio.Future[T]"
+) -> None:
+    # Retrieving the exception keeps asyncio from logging it as never retrieved
+    if attempt.cancelled() or attempt.exception() is not None:
+        return
+
+    if on_discard is not None:
+        on_discard(attempt.result())
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class CircuitBreakerPolicy:
+    """
+    When to stop sending requests to an unhealthy host.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests to that host fail immediately with `CircuitOpenError`. Every
+    `recovery_timeout` seconds a background probe checks the host; the first
+    successful probe closes the circuit again.
+
+    `probe` receives the origin of the host (eg: "https://www.mercadopublico.cl")
+    and returns whether it is healthy. By default, a HEAD request to its root
+    must answer below 500. Replace it when that request cannot succeed, eg:
+    under fixture replay, where it was never recorded.
+    """
+
+    failure_threshold: int = 5
+    recovery_timeout: float = 30.0
+    probe: Callable[[str], Awaitable[bool]] | None = None
+
+    def __post_init__(self) -> None:
+        if self.failure_threshold <= 0:
+            raise ValueError("failure_threshold must be a positive integer.")
+
+        if self.recovery_timeout <= 0:
+            raise ValueError("recovery_timeout must be positive.")
+
+
+class CircuitBreaker:
+    """Circuit breaker for a single host."""
+
+    def __init__(
+        self,
+        host: str,
+        policy: CircuitBreakerPolicy,
+        probe: Callable[[], Awaitable[bool]],
+    ) -> None:
+        self.host = host
+        self.policy = policy
+        self.state = CircuitState.CLOSED
+
+        self._probe = probe
+        self._failures = 0
+        self._probe_task: asyncio.Task[None] | None = None
+
+    def check(self) -> None:
+        """Raise `CircuitOpenError` if requests to this host must fail fast."""
+
+        if self.state is not CircuitState.CLOSED:
+            raise CircuitOpenError(
+                f"Circuit open for {self.host}: too many consecutive failures"
+            )
+
+    def record_success(self) -> None:
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        self._failures += 1
+
+        if (
+            self.state is CircuitState.CLOSED
+            and self._failures >= self.policy.failure_threshold
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        logger.warning("Circuit opened for %s", self.host)
+
+        self.state = CircuitState.OPEN
+        self._probe_task = asyncio.ensure_future(self._recover())
+
+    async def _recover(self) -> None:
+        while True:
+            await asyncio.sleep(self.policy.recovery_timeout)
+
+            self.state = CircuitState.HALF_OPEN
+
+            try:
+                healthy = await self._probe()
+            except Exception:
+                healthy = False
+
+            if healthy:
+                logger.info("Circuit closed for %s", self.host)
+
+                self.state = CircuitState.CLOSED
+                self._failures = 0
+                self._probe_task = None
+
+                return
+
+            self.state = CircuitState.OPEN
+
+    def close(self) -> None:
+        """Stop the background probe, if any."""
+
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
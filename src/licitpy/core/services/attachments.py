@@ -1,13 +1,16 @@
 import base64
 import secrets
 from functools import partial
-
-from aiohttp import ClientResponse
-from tqdm import tqdm
+from typing import TYPE_CHECKING
 
 from licitpy.core.enums import Attachment
+from licitpy.core.filetypes import SNIFF_BYTES, sniff_file_type
 from licitpy.core.http import AsyncHttpClient
 from licitpy.core.parser.attachments import AttachmentParser
+from licitpy.core.progress import ProgressReporter, TqdmProgressReporter
+
+if TYPE_CHECKING:
+    from aiohttp import ClientResponse
 
 
 # TODO: this should go in Chile
@@ -16,9 +19,11 @@ class AttachmentServices:
         self,
         downloader: AsyncHttpClient | None = None,
         parser: AttachmentParser | None = None,
+        progress: ProgressReporter | None = None,
     ):
         self._downloader: AsyncHttpClient = downloader or AsyncHttpClient()
         self._parser: AttachmentParser = parser or AttachmentParser()
+        self._progress: ProgressReporter = progress or TqdmProgressReporter()
 
     async def get_attachments(self, url: str, html: str) -> list[Attachment]:
         """
@@ -42,6 +47,9 @@ class AttachmentServices:
     ) -> str:
         """
         Downloads an attachment from a URL using a POST request with the attachment ID.
+
+        The attachment's `file_type`, guessed from its name by the parser, is
+        replaced by the type sniffed from the downloaded content.
         """
 
         file_code = attachment.id
@@ -55,49 +63,63 @@ class AttachmentServices:
         # this request should be made without the cache
         html = await self._downloader.get_html_by_url(url)
 
-        response: ClientResponse = await self._downloader.session.post(
-            url,
-            data={
-                "__EVENTTARGET": "",
-                "__EVENTARGUMENT": "",
-                "__VIEWSTATE": self._parser.get_view_state(html),
-                "__VIEWSTATEGENERATOR": "13285B56",
-                # Random parameters that simulate the button click
-                f"DWNL$grdId$ctl{file_code}$search.x": search_x,
-                f"DWNL$grdId$ctl{file_code}$search.y": search_y,
-                "DWNL$ctl10": "",
-            },
-            timeout=30,
-        )
-
-        return await self.download_file_base64(response, file_size, file_name)
+        metrics = self._downloader.metrics
+
+        await self._downloader.throttle()
+
+        with metrics.in_flight(), metrics.stage("attachment_download"):
+            response: "ClientResponse" = await self._downloader.session.post(
+                url,
+                data={
+                    "__EVENTTARGET": "",
+                    "__EVENTARGUMENT": "",
+                    "__VIEWSTATE": self._parser.get_view_state(html),
+                    "__VIEWSTATEGENERATOR": "13285B56",
+                    # Random parameters that simulate the button click
+                    f"DWNL$grdId$ctl{file_code}$search.x": search_x,
+                    f"DWNL$grdId$ctl{file_code}$search.y": search_y,
+                    "DWNL$ctl10": "",
+                },
+                timeout=30,
+            )
 
-    async def download_file_base64(
-        self,
-        response: ClientResponse,
-        file_size: int,
-        file_name: str,
-    ) -> str:
+            data = await self.read_file(response, file_size, file_name)
+
+        attachment.file_type = sniff_file_type(data[:SNIFF_BYTES], file_name)
+
+        return base64.b64encode(data).decode("utf-8")
+
+    async def read_file(
+        self, response: "ClientResponse", file_size: int, file_name: str
+    ) -> bytes:
         """
-        Downloads the file content from the response and encodes it in base64.
-        This function reads the file in chunks to handle large files efficiently.
+        Reads the file content from the response in chunks, reporting the
+        download progress.
         """
 
         file_content = bytearray()
+        task = self._progress.start(file_name, file_size)
 
-        with tqdm(
-            total=file_size,
-            unit="B",
-            unit_scale=True,
-            desc=f"Downloading {file_name}",
-            disable=False,
-        ) as progress_bar:
+        try:
             async for chunk in response.content.iter_chunked(8192):
                 if chunk:
                     file_content.extend(chunk)
-                    progress_bar.update(len(chunk))
-                    progress_bar.refresh()
+                    self._progress.advance(task, len(chunk))
+        finally:
+            self._progress.finish(task)
+
+        self._downloader.record_response("POST", response, len(file_content))
+
+        return bytes(file_content)
+
+    async def download_file_base64(
+        self, response: "ClientResponse", file_size: int, file_name: str
+    ) -> str:
+        """
+        Downloads the file content from the response and encodes it in base64.
+        This function reads the file in chunks to handle large files efficiently.
+        """
 
-        base64_content = base64.b64encode(file_content).decode("utf-8")
+        file_content = await self.read_file(response, file_size, file_name)
 
-        return base64_content
+        return base64.b64encode(file_content).decode("utf-8")
@@ -0,0 +1,57 @@
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def _private_defaults(model_cls: type[BaseModel]) -> tuple[tuple[str, Any], ...]:
+    """Private attributes of a model that declare a default value."""
+
+    defaults: list[tuple[str, Any]] = []
+
+    for name, private in model_cls.__private_attributes__.items():
+        default = private.get_default()
+
+        if default is not PydanticUndefined:
+            defaults.append((name, default))
+
+    return tuple(defaults)
+
+
+@lru_cache(maxsize=None)
+def _field_names(model_cls: type[BaseModel]) -> frozenset[str]:
+    return frozenset(model_cls.model_fields)
+
+
+def construct_trusted(model_cls: type[ModelT], values: dict[str, Any]) -> ModelT:
+    """
+    Build a pydantic model from values produced by our own parsers.
+
+    No validation or coercion happens: `values` must contain every field with
+    the right type. This is cheaper than both `model_validate` and
+    `model_construct`, which still walks the fields in Python.
+    """
+
+    instance = model_cls.__new__(model_cls)
+
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(
+        instance, "__pydantic_fields_set__", set(_field_names(model_cls))
+    )
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    # Like pydantic, None for models without private attributes
+    object.__setattr__(
+        instance,
+        "__pydantic_private__",
+        (
+            dict(_private_defaults(model_cls))
+            if model_cls.__private_attributes__
+            else None
+        ),
+    )
+
+    return instance
@@ -0,0 +1,232 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from licitpy.core.queue import QueueStats, WorkItem, WorkQueue
+
+if TYPE_CHECKING:
+    from licitpy.licitpy import Licitpy
+
+logger = logging.getLogger(__name__)
+
+# Work item kinds understood by CrawlWorker
+CL_TENDER = "cl.tender"  # payload: tender code
+EU_MONTH = "eu.month"  # payload: package month, "YYYY-MM"
+
+Handler = Callable[[str], Awaitable[Any]]
+Sink = Callable[[WorkItem, Any], Awaitable[None]]
+
+
+@dataclass
+class WorkerStats:
+    """Throughput of a single worker process."""
+
+    processed: int = 0
+    failed: int = 0
+    lost_leases: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+    finished_at: float | None = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class CrawlWorker:
+    """
+    Pulls tender codes and EU package months from a shared `WorkQueue`.
+
+    Run one worker per process (or host) against the same queue to split
+    the load: items are leased, so no two workers fetch the same one.
+    Leases of items still in progress are extended in the background, and
+    an item whose worker dies becomes visible again after `visibility_timeout`.
+    An item whose lease could not be extended is abandoned, another worker
+    may already have it. Failed items are retried after an exponential
+    backoff.
+
+    async with Licitpy() as client:
+        worker = CrawlWorker(client, SQLiteWorkQueue("queue.sqlite"), sink=save)
+        stats = await worker.run()
+
+    Args:
+        client: Open `Licitpy` client used to fetch the items.
+        queue: Shared work queue.
+        sink: Awaited with each item and its result (a `Tender` for tender
+            codes, the download summary for EU months).
+        concurrency: Items processed at the same time by this worker.
+        visibility_timeout: Seconds a leased item stays invisible to other workers.
+        poll_interval: Seconds to wait before polling an empty queue again.
+        retry_delay: Seconds before a failed item is retried, doubled on each
+            further attempt.
+        max_retry_delay: Upper bound of the retry delay.
+    """
+
+    def __init__(
+        self,
+        client: "Licitpy",
+        queue: WorkQueue,
+        sink: Sink | None = None,
+        concurrency: int = 10,
+        visibility_timeout: float = 300.0,
+        poll_interval: float = 1.0,
+        retry_delay: float = 5.0,
+        max_retry_delay: float = 300.0,
+    ) -> None:
+        if concurrency <= 0:
+            raise ValueError("concurrency must be a positive integer.")
+
+        self.client = client
+        self.queue = queue
+        self.sink = sink
+        self.concurrency = concurrency
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+
+        self.handlers: dict[str, Handler] = {
+            CL_TENDER: lambda code: self.client.cl.get_by_code(code),
+            EU_MONTH: lambda when: self.client.eu.download_monthly_bulk_file(when),
+        }
+
+        self.stats = WorkerStats()
+        self._in_progress: dict[int, tuple[WorkItem, asyncio.Future[None]]] = {}
+
+    def register(self, kind: str, handler: Handler) -> None:
+        """Handle items of another `kind` with `handler(payload)`."""
+        self.handlers[kind] = handler
+
+    async def _process(self, item: WorkItem) -> None:
+        handler = self.handlers.get(item.kind)
+
+        try:
+            if handler is None:
+                raise ValueError(
+                    f"No handler registered for work item kind: {item.kind}"
+                )
+
+            result = await handler(item.payload)
+
+            if self.sink is not None:
+                await self.sink(item, result)
+
+        except Exception as e:
+            logger.warning("Work item %s (%s) failed: %r", item.payload, item.kind, e)
+
+            self.stats.failed += 1
+            await self.queue.release(
+                item, error=repr(e), delay=self.backoff(item.attempts)
+            )
+
+            return
+
+        finally:
+            self._in_progress.pop(item.id, None)
+
+        if await self.queue.ack(item):
+            self.stats.processed += 1
+        else:
+            # The lease expired and another worker may have picked the item up
+            self.stats.lost_leases += 1
+
+    def backoff(self, attempts: int) -> float:
+        """Seconds before retrying an item that failed its `attempts`-th attempt."""
+        return min(self.max_retry_delay, self.retry_delay * 2 ** (attempts - 1))
+
+    async def _heartbeat(self) -> None:
+        """Extend the leases of the items in progress before they expire."""
+
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 2)
+
+            for item, task in list(self._in_progress.values()):
+                try:
+                    if await self.queue.extend(item, self.visibility_timeout):
+                        continue
+
+                    # The lease expired and another worker may have picked the item up
+                    logger.warning(
+                        "Lost the lease of work item %s (%s), abandoning it",
+                        item.payload,
+                        item.kind,
+                    )
+                except Exception as e:
+                    # Unrenewed, the lease expires and another worker may take the item
+                    logger.warning(
+                        "Could not extend the lease of work item %s (%s), abandoning it: %r",
+                        item.payload,
+                        item.kind,
+                        e,
+                    )
+
+                self.stats.lost_leases += 1
+                self._in_progress.pop(item.id, None)
+                task.cancel()
+
+    async def _finished(self) -> bool:
+        """Whether no item is left to lease, now or later, by any worker."""
+
+        stats = await self.queue.stats()
+
+        # Items leased by other workers may still be released or expire
+        return stats.pending == 0 and stats.leased == 0
+
+    async def run(self, stop_when_empty: bool = True) -> WorkerStats:
+        """
+        Process items until the queue is empty and no worker holds a lease,
+        or forever if `stop_when_empty` is False. Returns this worker's
+        statistics.
+        """
+
+        self.stats = WorkerStats()
+        heartbeat = asyncio.ensure_future(self._heartbeat())
+        running: set[asyncio.Future[None]] = set()
+
+        try:
+            while True:
+                free = self.concurrency - len(running)
+                items = (
+                    await self.queue.lease(free, self.visibility_timeout)
+                    if free
+                    else []
+                )
+
+                for item in items:
+                    processing = asyncio.ensure_future(self._process(item))
+                    self._in_progress[item.id] = (item, processing)
+                    running.add(processing)
+
+                if not running:
+                    if stop_when_empty and await self._finished():
+                        break
+
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+
+                # With free slots, poll again later for items queued meanwhile
+                _, running = await asyncio.wait(
+                    running,
+                    timeout=(
+                        self.poll_interval if len(running) < self.concurrency else None
+                    ),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+        finally:
+            heartbeat.cancel()
+
+            for task in running:
+                task.cancel()
+
+            self.stats.finished_at = time.perf_counter()
+
+        return self.stats
+
+    async def queue_stats(self) -> QueueStats:
+        """Aggregate progress and throughput of every worker sharing the queue."""
+        return await self.queue.stats()
@@ -1,7 +1,7 @@
 import re
 from datetime import datetime
-from zoneinfo import ZoneInfo
 
+from licitpy.core.dates import parse_day_month_year_time
 from licitpy.core.enums import Attachment
 from licitpy.core.exceptions import AttachmentUrlHashNotFound
 from licitpy.core.parser.attachments import AttachmentParser
@@ -45,9 +45,7 @@ class ChileTenderParser(BaseParser):
         opening_date = self.get_text_by_element_id(html, "lblFicha3Publicacion")
 
         # eg: 06-08-2024 9:11:02
-        return datetime.strptime(opening_date, "%d-%m-%Y %H:%M:%S").replace(
-            tzinfo=ZoneInfo("America/Santiago")
-        )
+        return parse_day_month_year_time(opening_date)
 
     def get_closing_date_from_eligibility(self, html: str) -> datetime:
         """
@@ -61,12 +59,8 @@ class ChileTenderParser(BaseParser):
         # Example date format from the HTML: "16-12-2024 12:00:00"
         closing_date = self.get_text_by_element_id(html, "lblFicha3CierreIdoneidad")
 
-        # Parse the extracted date string into a datetime object, ensuring the correct format and time zone.
-        return datetime.strptime(closing_date, "%d-%m-%Y %H:%M:%S").replace(
-            tzinfo=ZoneInfo(
-                "America/Santiago"
-            )  # Set the time zone to Chile's local time.
-        )
+        # Parse the extracted date string into a datetime object in Chile's local time.
+        return parse_day_month_year_time(closing_date)
 
     def get_closing_date(self, html: str) -> datetime:
         """
@@ -87,12 +81,8 @@ class ChileTenderParser(BaseParser):
         # Example: "11-11-2024 15:00:00"
         closing_date = self.get_text_by_element_id(html, "lblFicha3Cierre")
 
-        # Parse the extracted date string into a datetime object, ensuring the correct format and time zone.
-        return datetime.strptime(closing_date, "%d-%m-%Y %H:%M:%S").replace(
-            tzinfo=ZoneInfo(
-                "America/Santiago"
-            )  # Set the time zone to Chile's local time.
-        )
+        # Parse the extracted date string into a datetime object in Chile's local time.
+        return parse_day_month_year_time(closing_date)
 
     def get_title(self, html: str) -> str:
         """
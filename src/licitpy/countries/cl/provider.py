@@ -1,10 +1,52 @@
+import asyncio
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime
+from functools import partial
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, TypeVar
 from urllib.parse import urljoin
 
+from licitpy.core.http import AsyncHttpClient
+from licitpy.core.metrics import STAGE_DURATION
 from licitpy.core.models import Tender
 from licitpy.core.provider.tender import BaseTenderProvider
 from licitpy.core.services.attachments import AttachmentServices
 from licitpy.countries.cl.parser import ChileTenderParser
-from licitpy.core.http import AsyncHttpClient
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from licitpy.core.pipeline import Pipeline
+    from licitpy.core.progress import ProgressReporter
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _timed(fn: Callable[[T], R], arg: T) -> tuple[R, float]:
+    start = time.perf_counter()
+    result = fn(arg)
+
+    return result, time.perf_counter() - start
+
+
+@dataclass(frozen=True)
+class TenderPage:
+    """Raw detail page of a tender."""
+
+    code: str
+    html: str
+
+
+@dataclass(frozen=True)
+class TenderDetail:
+    """Fields parsed from the detail page, plus the attachment page once fetched."""
+
+    code: str
+    title: str
+    closing_date: datetime
+    attachment_url: str
+    attachment_html: str | None = None
 
 
 class MercadoPublicoChileProvider(BaseTenderProvider):
@@ -16,10 +58,13 @@ class MercadoPublicoChileProvider(BaseTenderProvider):
         downloader: AsyncHttpClient,
         parser: ChileTenderParser | None = None,
         attachment: AttachmentServices | None = None,
+        progress: "ProgressReporter | None" = None,
     ) -> None:
         self.downloader = downloader
         self.parser = parser or ChileTenderParser()
-        self.attachment = attachment or AttachmentServices(downloader=self.downloader)
+        self.attachment = attachment or AttachmentServices(
+            downloader=self.downloader, progress=progress
+        )
 
     async def get_url_by_code(self, code: str) -> str:
         """
@@ -37,36 +82,147 @@ class MercadoPublicoChileProvider(BaseTenderProvider):
 
         url = f"{self.BASE_URL}/Procurement/Modules/RFB/DetailsAcquisition.aspx?idlicitacion={code}"
 
-        response = await self.downloader.session.head(
-            url, timeout=30, allow_redirects=False
-        )
+        response = await self.downloader.head(url, timeout=30, allow_redirects=False)
 
         if "Location" not in response.headers:
             raise ValueError(f"No redirection found for tender code: {code}")
 
         return urljoin(self.BASE_URL, response.headers["Location"])
 
-    async def get_by_code(self, code: str) -> Tender:
-        
+    async def fetch_tender_page(self, code: str) -> TenderPage:
+        """Resolve and download the detail page of a tender (network bound)."""
+
         if not code.strip():
             raise ValueError("Tender code cannot be empty or whitespace.")
 
-        url = await self.get_url_by_code(code)
-        html = await self.downloader.get_html_by_url(url)
+        metrics = self.downloader.metrics
+
+        with metrics.stage("head_redirect"):
+            url = await self.get_url_by_code(code)
+
+        with metrics.stage("detail_fetch"):
+            html = await self.downloader.get_html_by_url(url)
+
+        return TenderPage(code=code, html=html)
+
+    def parse_tender_page(self, page: TenderPage) -> TenderDetail:
+        """
+        Parse the detail page (CPU bound, safe to run in a thread pool).
+
+        It records no metrics, see `parse_tender`.
+        """
+
+        return TenderDetail(
+            code=page.code,
+            title=self.parser.get_title(page.html),
+            closing_date=self.parser.get_closing_date(page.html),
+            attachment_url=self.parser.get_attachment_url(page.html),
+        )
+
+    async def parse_tender(
+        self, page: TenderPage, executor: "Executor | None" = None
+    ) -> TenderDetail:
+        """Parse the detail page, in `executor` if given, timed as the parse stage."""
+
+        metrics = self.downloader.metrics
 
-        title = self.parser.get_title(html)
-        closing_date = self.parser.get_closing_date(html)
+        if executor is None:
+            with metrics.stage("parse"):
+                return self.parse_tender_page(page)
 
-        attachment_url = self.parser.get_attachment_url(html)
-        attachment_html = await self.downloader.get_html_by_url(attachment_url)
-        attachments = await self.attachment.get_attachments(
-            attachment_url, attachment_html
+        loop = asyncio.get_running_loop()
+        detail, seconds = await loop.run_in_executor(
+            executor, _timed, self.parse_tender_page, page
         )
 
-        return Tender(
-            code=code,
-            title=title,
-            closing_date=closing_date,
-            attachment_url=attachment_url,
-            attachments=attachments,
+        # Recorded from the event loop: the registry is not thread safe and
+        # the batch scopes of Metrics.batch() do not reach executor threads.
+        metrics.observe(STAGE_DURATION, seconds, {"stage": "parse"})
+
+        return detail
+
+    async def fetch_attachment_page(self, detail: TenderDetail) -> TenderDetail:
+        """Download the attachment listing of a parsed tender (network bound)."""
+
+        with self.downloader.metrics.stage("attachment_fetch"):
+            html = await self.downloader.get_html_by_url(detail.attachment_url)
+
+        return replace(detail, attachment_html=html)
+
+    async def build_tender(self, detail: TenderDetail) -> Tender:
+        """Parse the attachments and build the `Tender`."""
+
+        if detail.attachment_html is None:
+            detail = await self.fetch_attachment_page(detail)
+
+        metrics = self.downloader.metrics
+
+        with metrics.stage("attachment_parse"):
+            attachments = await self.attachment.get_attachments(
+                detail.attachment_url, detail.attachment_html or ""
+            )
+
+        with metrics.stage("model_build"):
+            # Every field comes from our own parser, so skip re-validation.
+            return Tender.from_trusted(
+                code=detail.code,
+                title=detail.title,
+                closing_date=detail.closing_date,
+                attachment_url=detail.attachment_url,
+                attachments=attachments,
+            )
+
+    async def get_by_code(self, code: str) -> Tender:
+        page = await self.fetch_tender_page(code)
+        detail = await self.fetch_attachment_page(await self.parse_tender(page))
+
+        return await self.build_tender(detail)
+
+    def pipeline(
+        self,
+        sink: Callable[[Tender], Awaitable[Any]],
+        fetch_concurrency: int = 10,
+        parse_concurrency: int = 2,
+        parse_executor: "Executor | None" = None,
+        sink_concurrency: int = 1,
+        queue_size: int = 100,
+        on_error: Callable[[str, Any, Exception], None] | None = None,
+    ) -> "Pipeline":
+        """
+        Build a backpressured pipeline that turns tender codes into `Tender`s.
+
+        Stages: fetch (detail page) -> parse -> attachments (listing page)
+        -> build -> sink. A slow sink fills the queues in front of it and
+        pauses the fetchers instead of buffering pages in memory.
+
+        async with Licitpy() as client, NDJSONWriter("tenders.ndjson") as writer:
+            stats = await client.cl.pipeline(writer.write).run(codes)
+
+        Args:
+            sink: Awaited with each `Tender`.
+            fetch_concurrency: Detail and attachment pages fetched at the same time.
+            parse_concurrency: Detail pages parsed at the same time.
+            parse_executor: Thread pool to parse in, off the event loop.
+            sink_concurrency: Tenders passed to `sink` at the same time.
+            queue_size: Capacity of the queue in front of each stage.
+            on_error: See `Pipeline`; by default the first error stops the run.
+        """
+
+        from licitpy.core.pipeline import Pipeline, Stage
+
+        return Pipeline(
+            [
+                Stage("fetch", self.fetch_tender_page, fetch_concurrency),
+                Stage(
+                    "parse",
+                    partial(self.parse_tender, executor=parse_executor),
+                    parse_concurrency,
+                ),
+                Stage("attachments", self.fetch_attachment_page, fetch_concurrency),
+                Stage("build", self.build_tender, parse_concurrency),
+                Stage("sink", sink, sink_concurrency),
+            ],
+            queue_size=queue_size,
+            metrics=self.downloader.metrics,
+            on_error=on_error,
         )
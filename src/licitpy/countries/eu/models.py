@@ -0,0 +1,56 @@
+from pydantic import BaseModel
+
+from licitpy.core.trusted import construct_trusted
+
+
+class Notice(BaseModel):
+    """
+    A notice from a TED bulk package, either TED XML (R2) or eForms.
+
+    Attributes:
+        notice_id: Publication number, eg: "123456-2024".
+        publication_date: ISO date, eg: "2024-01-31".
+        country: Buyer country as ISO 3166-1 alpha-2 code when known.
+        cpv: CPV codes, main classification first. For eForms, the codes of
+            the procedure, lot codes are not included.
+        title: Title of the procurement, in the language of the notice.
+        notice_format: "ted-r2" or "eforms".
+        source: Name of the XML file inside the package.
+    """
+
+    notice_id: str | None
+    publication_date: str | None
+    country: str | None
+    cpv: list[str]
+    title: str | None
+    notice_format: str
+    source: str
+
+    @classmethod
+    def from_trusted(
+        cls,
+        notice_id: str | None,
+        publication_date: str | None,
+        country: str | None,
+        cpv: list[str],
+        title: str | None,
+        notice_format: str,
+        source: str,
+    ) -> "Notice":
+        """Build a notice from values extracted by `EUTenderParser`."""
+
+        return construct_trusted(
+            cls,
+            {
+                "notice_id": notice_id,
+                "publication_date": publication_date,
+                "country": country,
+                "cpv": cpv,
+                "title": title,
+                "notice_format": notice_format,
+                "source": source,
+            },
+        )
+
+    class Config:
+        extra = "forbid"
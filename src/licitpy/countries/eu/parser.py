@@ -1,4 +1,551 @@
+import os
+import re
+import tarfile
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path, PurePosixPath
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+    cast,
+)
+
 from licitpy.core.parser.base import BaseParser
+from licitpy.countries.eu.models import Notice
+
+if TYPE_CHECKING:
+    from lxml.etree import _Element
+
+TED_R2 = "ted-r2"
+EFORMS = "eforms"
+
+# eForms uses ISO 3166-1 alpha-3 country codes, TED XML alpha-2
+ALPHA3_TO_ALPHA2 = {
+    "ALB": "AL", "AND": "AD", "ARM": "AM", "AUT": "AT", "AZE": "AZ",
+    "BEL": "BE", "BGR": "BG", "BIH": "BA", "BLR": "BY", "CHE": "CH",
+    "CYP": "CY", "CZE": "CZ", "DEU": "DE", "DNK": "DK", "ESP": "ES",
+    "EST": "EE", "FIN": "FI", "FRA": "FR", "GBR": "GB", "GEO": "GE",
+    "GRC": "GR", "HRV": "HR", "HUN": "HU", "IRL": "IE", "ISL": "IS",
+    "ITA": "IT", "LIE": "LI", "LTU": "LT", "LUX": "LU", "LVA": "LV",
+    "MCO": "MC", "MDA": "MD", "MKD": "MK", "MLT": "MT", "MNE": "ME",
+    "NLD": "NL", "NOR": "NO", "POL": "PL", "PRT": "PT", "ROU": "RO",
+    "SMR": "SM", "SRB": "RS", "SVK": "SK", "SVN": "SI", "SWE": "SE",
+    "TUR": "TR", "UKR": "UA", "XKX": "XK",
+}  # fmt: skip
+
+NESTED_PACKAGE_SUFFIXES = (".tar.gz", ".tgz", ".tar")
+
+# Daily editions are named after their publication date, eg: 20240102_000001.tar.gz
+EDITION_NAME = re.compile(r"(20\d\d)(0[1-9]|1[0-2])(0[1-9]|[12]\d|3[01])_")
+
+NOTICE_FIELDS = ("notice_id", "publication_date", "country", "cpv", "title")
+
+# Most notices are decided within their first kilobytes
+SCAN_CHUNK_SIZE = 16 * 1024
+
+# The streaming parser only reports these elements
+SCANNED_TAGS = tuple(
+    f"{{*}}{name}"
+    for name in (
+        # TED XML (R2)
+        "DATE_PUB",
+        "ISO_COUNTRY",
+        "ORIGINAL_CPV",
+        "NOTICE_DATA",
+        "CODED_DATA_SECTION",
+        "TITLE",
+        # eForms
+        "NoticePublicationID",
+        "PublicationDate",
+        "IssueDate",
+        "IdentificationCode",
+        "ItemClassificationCode",
+        "UBLExtensions",
+        "Name",
+        "ProcurementProject",
+    )
+)
+
+
+def local_name(element: "_Element") -> str:
+    tag = element.tag
+
+    if not isinstance(tag, str):
+        return ""
+
+    return tag.rsplit("}", 1)[-1]
+
+
+def normalize_country(code: str | None) -> str | None:
+    if not code:
+        return None
+
+    code = code.strip().upper()
+
+    return ALPHA3_TO_ALPHA2.get(code, code)
+
+
+def normalize_date(value: str | None) -> str | None:
+    """Normalize TED XML (20240131) and eForms (2024-01-31+01:00) dates to 2024-01-31."""
+
+    if not value:
+        return None
+
+    value = value.strip()
+
+    if len(value) == 8 and value.isdigit():
+        return f"{value[:4]}-{value[4:6]}-{value[6:]}"
+
+    return value[:10]
+
+
+def edition_date(name: str) -> str | None:
+    """
+    Publication date of the daily edition a package member belongs to, from
+    the name of its archive or folder, eg: "20240102_000001/123-2024.xml".
+    """
+
+    parts = PurePosixPath(name).parts
+
+    # Notice file names are numbers that could pass for a date
+    if name.endswith(".xml"):
+        parts = parts[:-1]
+
+    for part in reversed(parts):
+        match = EDITION_NAME.match(part)
+
+        if match:
+            return f"{match[1]}-{match[2]}-{match[3]}"
+
+    return None
+
+
+def _strings(values: Collection[str]) -> tuple[str, ...]:
+    # A single code, not a collection of characters
+    return (values,) if isinstance(values, str) else tuple(values)
+
+
+@dataclass(frozen=True)
+class NoticeQuery:
+    """
+    Filters and projection applied while a bulk package is scanned.
+
+    A notice is dropped as soon as a filter rules it out, usually before its
+    forms are parsed, and daily editions outside the publication dates are
+    skipped without being opened.
+
+    Attributes:
+        countries: Buyer countries to keep, as alpha-2 or alpha-3 codes.
+        cpv_prefixes: Keep notices with a CPV code starting with any of these, eg: "45" for construction works.
+        published_from: First publication date to keep, eg: "2024-01-15".
+        published_until: Last publication date to keep.
+        fields: Notice fields to extract, the others are left empty (default: all).
+    """
+
+    countries: Collection[str] | None = None
+    cpv_prefixes: Collection[str] | None = None
+    published_from: str | None = None
+    published_until: str | None = None
+    fields: Collection[str] | None = None
+
+    def __post_init__(self) -> None:
+        if self.countries is not None:
+            countries = map(normalize_country, _strings(self.countries))
+            object.__setattr__(self, "countries", frozenset(filter(None, countries)))
+
+        if self.cpv_prefixes is not None:
+            prefixes = tuple(prefix.strip() for prefix in _strings(self.cpv_prefixes))
+            object.__setattr__(self, "cpv_prefixes", prefixes)
+
+        if self.fields is not None:
+            fields = frozenset(_strings(self.fields))
+            unknown = fields.difference(NOTICE_FIELDS)
+
+            if unknown:
+                raise ValueError(
+                    f"Unknown notice fields: {', '.join(sorted(unknown))}. "
+                    f"Valid fields are: {', '.join(NOTICE_FIELDS)}."
+                )
+
+            object.__setattr__(self, "fields", fields)
+
+        object.__setattr__(self, "published_from", normalize_date(self.published_from))
+        object.__setattr__(
+            self, "published_until", normalize_date(self.published_until)
+        )
+
+    @property
+    def needed(self) -> frozenset[str]:
+        """Fields to extract: the projected ones plus the ones filtered on."""
+
+        needed = set(NOTICE_FIELDS if self.fields is None else self.fields)
+
+        if self.countries is not None:
+            needed.add("country")
+
+        if self.cpv_prefixes is not None:
+            needed.add("cpv")
+
+        if self.published_from or self.published_until:
+            needed.add("publication_date")
+
+        return frozenset(needed)
+
+    def projects(self, field: str) -> bool:
+        return self.fields is None or field in self.fields
+
+    def matches_date(self, date: str | None) -> bool:
+        if not (self.published_from or self.published_until):
+            return True
+
+        if date is None:
+            return False
+
+        if self.published_from and date < self.published_from:
+            return False
+
+        return not (self.published_until and date > self.published_until)
+
+    def keeps_member(self, name: str) -> bool:
+        """Whether a package member may hold matching notices, judging by its name."""
+
+        date = edition_date(name)
+
+        return date is None or self.matches_date(date)
+
+
+ALL_NOTICES = NoticeQuery()
+
+
+class _NoticeScan:
+    """
+    Values of a notice collected while it is parsed, and what the query can
+    already decide from them.
+    """
+
+    def __init__(self, query: NoticeQuery) -> None:
+        self.query = query
+        self.needed = query.needed
+
+        self.values: dict[str, str | None] = {}
+        self.cpv: list[str] = []
+        self.cpv_matched = query.cpv_prefixes is None
+
+        # Fields whose final value is known, later elements cannot change them
+        self.known: set[str] = set()
+
+    def wants(self, field: str) -> bool:
+        return field in self.needed and field not in self.known
+
+    def found(self, field: str, value: str | None) -> None:
+        if field not in self.known:
+            self.values[field] = value
+            self.known.add(field)
+
+    def finish(self, *fields: str) -> None:
+        """Mark `fields` as known, the ones not found stay empty."""
+
+        for field in fields:
+            self.found(field, None)
+
+    def add_cpv(self, code: str | None) -> None:
+        if not code or "cpv" in self.known or code in self.cpv:
+            return
+
+        self.cpv.append(code)
+
+        prefixes = self.query.cpv_prefixes
+
+        if not self.cpv_matched and prefixes is not None:
+            self.cpv_matched = code.startswith(tuple(prefixes))
+
+            # Filtered on but not projected, the remaining codes do not matter
+            if self.cpv_matched and not self.query.projects("cpv"):
+                self.known.add("cpv")
+
+    def rejected(self) -> bool:
+        query = self.query
+
+        if query.countries is not None and "country" in self.known:
+            if self.values["country"] not in query.countries:
+                return True
+
+        if not self.cpv_matched and "cpv" in self.known:
+            return True
+
+        return "publication_date" in self.known and not query.matches_date(
+            self.values["publication_date"]
+        )
+
+    def complete(self) -> bool:
+        return self.needed <= self.known
+
+    def notice(self, notice_format: str, source: str) -> Notice:
+        def value(field: str) -> str | None:
+            return self.values.get(field) if self.query.projects(field) else None
+
+        return Notice.from_trusted(
+            notice_id=value("notice_id"),
+            publication_date=value("publication_date"),
+            country=value("country"),
+            cpv=self.cpv if self.query.projects("cpv") else [],
+            title=value("title"),
+            notice_format=notice_format,
+            source=source,
+        )
+
+
+def _scan_ted_r2(scan: _NoticeScan, name: str, element: "_Element") -> None:
+    if name == "DATE_PUB":
+        scan.found("publication_date", normalize_date(element.text))
+
+    elif name == "ISO_COUNTRY":
+        scan.found("country", normalize_country(element.get("VALUE")))
+
+    elif name == "ORIGINAL_CPV":
+        scan.add_cpv(element.get("CODE"))
+
+    elif name == "NOTICE_DATA":
+        scan.finish("country", "cpv")
+
+    elif name == "CODED_DATA_SECTION":
+        # Everything but the title is coded before the forms
+        scan.finish("publication_date", "country", "cpv")
+
+    elif name == "TITLE" and scan.wants("title"):
+        title = " ".join(
+            text.strip() for text in element.itertext() if isinstance(text, str)
+        ).strip()
+
+        scan.found("title", title or None)
+
+
+def _scan_eforms(scan: _NoticeScan, name: str, element: "_Element") -> None:
+    if name == "NoticePublicationID":
+        scan.found("notice_id", (element.text or "").strip() or None)
+
+    elif name in ("PublicationDate", "IssueDate"):
+        scan.found("publication_date", normalize_date(element.text))
+
+    elif name == "IdentificationCode" and scan.wants("country"):
+        parent = element.getparent()
+
+        # The first country in the document is the one of the buyer
+        if parent is not None and local_name(parent) == "Country":
+            scan.found("country", normalize_country(element.text))
+
+    elif name == "ItemClassificationCode" and element.get("listName") == "cpv":
+        scan.add_cpv((element.text or "").strip())
+
+    elif name == "UBLExtensions":
+        parent = element.getparent()
+
+        # The notice extension holds the organizations and the publication ID
+        if parent is not None and parent.getparent() is None:
+            scan.finish("notice_id", "country")
+
+    elif name == "Name" and scan.wants("title"):
+        parent = element.getparent()
+
+        if parent is not None and local_name(parent) == "ProcurementProject":
+            scan.found("title", (element.text or "").strip() or None)
+
+    elif name == "ProcurementProject":
+        parent = element.getparent()
+
+        # The project of the whole procedure comes before the lots, the
+        # notice takes its name and codes, not the ones of each lot
+        if parent is not None and parent.getparent() is None:
+            scan.finish("cpv", "title")
+
+
+def _iter_scanned(file: IO[bytes]) -> Iterator["_Element"]:
+    """
+    Scanned elements of an XML document, as they are closed. The document is
+    read in chunks, so nothing after the last element consumed is parsed.
+    """
+
+    from lxml import etree
+
+    parser = etree.XMLPullParser(
+        events=("end",), tag=SCANNED_TAGS, resolve_entities=False, no_network=True
+    )
+    scanned = False
+
+    def events() -> Iterator["_Element"]:
+        nonlocal scanned
+
+        for _, element in parser.read_events():
+            scanned = True
+            yield cast("_Element", element)
+
+    while chunk := file.read(SCAN_CHUNK_SIZE):
+        parser.feed(chunk)
+        yield from events()
+
+    root = parser.close()
+    yield from events()
+
+    # Without any scanned element, the root still tells the format
+    if not scanned:
+        yield root
+
+
+def _scan_package(
+    parser: "EUTenderParser", path: str | Path, query: NoticeQuery | None
+) -> list[Notice]:
+    return list(parser.iter_package(path, query))
+
+
+class EUTenderParser(BaseParser):
+    def parse_notice(self, xml: bytes, source: str) -> Notice:
+        """
+        Parse a TED XML (R2) or eForms notice.
+        """
+
+        # Without a query no notice is dropped
+        return cast(Notice, self.scan_notice(BytesIO(xml), source))
+
+    def scan_notice(
+        self, file: IO[bytes], source: str, query: NoticeQuery | None = None
+    ) -> Notice | None:
+        """
+        Stream a TED XML (R2) or eForms notice, returning None as soon as
+        `query` rules it out. Parsing stops once every needed field is known.
+        """
+
+        scan = _NoticeScan(query or ALL_NOTICES)
+        root: "_Element | None" = None
+        notice_format = EFORMS
+        handler = _scan_eforms
+
+        for element in _iter_scanned(file):
+            if root is None:
+                root = element.getroottree().getroot()
+
+                if local_name(root) == "TED_EXPORT":
+                    notice_format, handler = TED_R2, _scan_ted_r2
+                    scan.found("notice_id", root.get("DOC_ID"))
+
+            handler(scan, local_name(element), element)
+
+            if scan.rejected():
+                return None
+
+            if scan.complete():
+                break
+
+        scan.finish(*NOTICE_FIELDS)
+
+        if scan.rejected():
+            return None
+
+        return scan.notice(notice_format, source)
+
+    def _iter_tar(
+        self, archive: tarfile.TarFile, query: NoticeQuery | None
+    ) -> Iterator[Notice]:
+        for member in archive:
+            if not member.isfile():
+                continue
+
+            nested = member.name.endswith(NESTED_PACKAGE_SUFFIXES)
+
+            if not nested and not member.name.endswith(".xml"):
+                continue
+
+            if query is not None and not query.keeps_member(member.name):
+                continue
+
+            file: IO[bytes] | None = archive.extractfile(member)
+
+            if file is None:
+                continue
+
+            if nested:
+                # Monthly packages hold one compressed archive per daily edition
+                with tarfile.open(fileobj=file, mode="r|*") as edition:
+                    yield from self._iter_tar(edition, query)
+
+                continue
+
+            notice = self.scan_notice(file, member.name, query)
+
+            if notice is not None:
+                yield notice
+
+    def iter_package(
+        self, path: str | Path, query: NoticeQuery | None = None
+    ) -> Iterator[Notice]:
+        """
+        Parse every notice of a TED bulk package (.tar.gz), streaming it
+        from disk without extracting it. With a `query`, only the matching
+        notices are returned.
+        """
+
+        with tarfile.open(path, mode="r|*") as archive:
+            yield from self._iter_tar(archive, query)
+
+    def iter_packages(
+        self,
+        paths: Iterable[str | Path],
+        query: NoticeQuery | None = None,
+        max_workers: int | None = None,
+        on_error: Callable[[str, Exception], None] | None = None,
+    ) -> Iterator[Notice]:
+        """
+        Scan several packages in parallel, one process per package, yielding
+        the notices package by package in the order of `paths`.
+
+        The notices of a package are sent back by its worker all at once,
+        which suits selective queries. Use `iter_package` to stream a whole
+        package instead.
+
+        Args:
+            max_workers: Number of processes (default: one per core).
+            on_error: Called with (path, exception) when a package fails, the
+                package is skipped. Without it, the error is raised.
+        """
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        workers = max_workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=workers)
+
+        remaining = iter(paths)
+        pending: deque[tuple[str | Path, Future[list[Notice]]]] = deque()
+
+        def submit() -> None:
+            path = next(remaining, None)
+
+            if path is not None:
+                future = executor.submit(_scan_package, self, path, query)
+                pending.append((path, future))
+
+        try:
+            # Finished packages wait in memory for the consumer, keep few ahead
+            for _ in range(workers + 1):
+                submit()
+
+            while pending:
+                path, future = pending.popleft()
+                submit()
+
+                try:
+                    notices = future.result()
+                except Exception as e:
+                    if on_error is None:
+                        raise
 
+                    on_error(str(path), e)
+                    continue
 
-class EUTenderParser(BaseParser): ...
+                yield from notices
+        finally:
+            executor.shutdown(cancel_futures=True)
@@ -1,12 +1,14 @@
 import asyncio
 from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
 
-import dateparser
-
+from licitpy.core.dates import parse_date
 from licitpy.core.http import AsyncHttpClient
 from licitpy.core.provider.tender import BaseTenderProvider
 from licitpy.countries.eu.downloader import EUTenderDownloader
-from licitpy.countries.eu.parser import EUTenderParser
+from licitpy.countries.eu.models import Notice
+from licitpy.countries.eu.parser import EUTenderParser, NoticeQuery
 
 
 class EUTenderProvider(BaseTenderProvider):
@@ -38,7 +40,8 @@ class EUTenderProvider(BaseTenderProvider):
             )
 
         if isinstance(when, str):
-            parsed_when = dateparser.parse(when)
+            # "YYYY-MM" is parsed directly, free-form input falls back to dateparser
+            parsed_when = parse_date(when)
 
             if parsed_when is None:
                 raise ValueError(
@@ -68,11 +71,8 @@ class EUTenderProvider(BaseTenderProvider):
         if int(year) < 2015:
             raise ValueError("Year must be 2015 or later.")
 
-        when = dateparser.parse(f"{year}-01-01")
-        
-        if when is None:
-            raise ValueError("Invalid year format. Please provide a valid year string.")
-        
+        when = datetime(int(year), 1, 1)
+
         # Create a list of tasks for each month in the year
         tasks = [
             self.download_monthly_bulk_file(when.replace(month=month))
@@ -82,3 +82,30 @@ class EUTenderProvider(BaseTenderProvider):
         # Execute all download tasks concurrently
         return await asyncio.gather(*tasks)
 
+    def iter_notices(
+        self, path: str | Path, query: NoticeQuery | None = None
+    ) -> Iterator[Notice]:
+        """
+        Parse the notices of a downloaded bulk file, eg: "downloads/eu/2024-1.tar.gz".
+
+        With a `query`, only the matching notices are parsed and returned:
+
+        query = NoticeQuery(countries=["ES", "PT"], cpv_prefixes=["45"])
+        notices = client.eu.iter_notices("downloads/eu/2024-1.tar.gz", query)
+        """
+
+        return self.parser.iter_package(path, query)
+
+    def iter_packages(
+        self,
+        paths: Iterable[str | Path],
+        query: NoticeQuery | None = None,
+        max_workers: int | None = None,
+        on_error: Callable[[str, Exception], None] | None = None,
+    ) -> Iterator[Notice]:
+        """
+        Scan several downloaded bulk files in parallel processes, eg: the 12
+        months of a year, see `EUTenderParser.iter_packages`.
+        """
+
+        return self.parser.iter_packages(paths, query, max_workers, on_error)
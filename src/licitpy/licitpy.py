@@ -1,10 +1,20 @@
 from datetime import timedelta
 from types import TracebackType
-from typing import Optional, Type
+from typing import TYPE_CHECKING, Optional, Type
 
-from licitpy.core.http import AsyncHttpClient
-from licitpy.countries.cl.provider import MercadoPublicoChileProvider
-from licitpy.countries.eu.provider import EUTenderProvider
+from licitpy.core.http import (
+    AsyncHttpClient,
+    ConnectionSettings,
+    SharedCacheSettings,
+)
+from licitpy.core.metrics import Metrics
+from licitpy.core.progress import ProgressReporter, TqdmProgressReporter
+
+if TYPE_CHECKING:
+    from licitpy.core.fixtures import HttpFixtures
+    from licitpy.core.resilience import CircuitBreakerPolicy, HedgePolicy
+    from licitpy.countries.cl.provider import MercadoPublicoChileProvider
+    from licitpy.countries.eu.provider import EUTenderProvider
 
 
 class Licitpy:
@@ -12,14 +22,33 @@ class Licitpy:
         self,
         use_cache: bool = True,
         cache_expire_after: timedelta = timedelta(hours=1),
+        metrics: Metrics | None = None,
+        fixtures: "HttpFixtures | None" = None,
+        connection: ConnectionSettings | None = None,
+        hedging: "HedgePolicy | None" = None,
+        circuit_breaker: "CircuitBreakerPolicy | None" = None,
+        progress: ProgressReporter | None = None,
+        rate_limit: float | None = None,
+        shared_cache: SharedCacheSettings | None = None,
     ):
         self.downloader = AsyncHttpClient(
             use_cache=use_cache,
             cache_expire_after=cache_expire_after,
+            metrics=metrics,
+            fixtures=fixtures,
+            connection=connection,
+            hedging=hedging,
+            circuit_breaker=circuit_breaker,
+            rate_limit=rate_limit,
+            shared_cache=shared_cache,
         )
 
-        self._cl_provider: Optional[MercadoPublicoChileProvider] = None
-        self._eu_provider: Optional[EUTenderProvider] = None
+        # Aggregated attachment download progress, use NullProgressReporter
+        # for headless runs.
+        self.progress = progress or TqdmProgressReporter()
+
+        self._cl_provider: Optional["MercadoPublicoChileProvider"] = None
+        self._eu_provider: Optional["EUTenderProvider"] = None
 
     async def __aenter__(self) -> "Licitpy":
         """Async context manager entry point."""
@@ -34,19 +63,32 @@ class Licitpy:
     ) -> None:
         """Closes async resources when exiting an async context."""
         await self.downloader.close()
+        self.progress.close()
+
+    @property
+    def metrics(self) -> Metrics:
+        """Metrics emitted by this client (see `licitpy.core.metrics`)."""
+        return self.downloader.metrics
 
     @property
-    def cl(self) -> MercadoPublicoChileProvider:
+    def cl(self) -> "MercadoPublicoChileProvider":
         """Lazy property for the Chile tender provider."""
         if self._cl_provider is None:
-            self._cl_provider = MercadoPublicoChileProvider(self.downloader)
+            # Providers (and their parsers/models) are imported on first use
+            from licitpy.countries.cl.provider import MercadoPublicoChileProvider
+
+            self._cl_provider = MercadoPublicoChileProvider(
+                self.downloader, progress=self.progress
+            )
 
         return self._cl_provider
 
     @property
-    def eu(self) -> EUTenderProvider:
+    def eu(self) -> "EUTenderProvider":
         """Lazy property for the EU tender provider."""
         if self._eu_provider is None:
+            from licitpy.countries.eu.provider import EUTenderProvider
+
             self._eu_provider = EUTenderProvider(self.downloader)
 
         return self._eu_provider
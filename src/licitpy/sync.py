@@ -0,0 +1,314 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta
+from functools import partial
+from pathlib import Path
+from types import TracebackType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Literal,
+    Optional,
+    Type,
+    TypeVar,
+    overload,
+)
+
+from licitpy.core.http import ConnectionSettings, SharedCacheSettings
+from licitpy.core.metrics import Metrics
+from licitpy.core.progress import ProgressReporter
+from licitpy.licitpy import Licitpy
+
+if TYPE_CHECKING:
+    from licitpy.core.enums import Attachment
+    from licitpy.core.fixtures import HttpFixtures
+    from licitpy.core.models import Tender
+    from licitpy.core.resilience import CircuitBreakerPolicy, HedgePolicy
+    from licitpy.countries.eu.models import Notice
+    from licitpy.countries.eu.parser import EUTenderParser, NoticeQuery
+
+T = TypeVar("T")
+
+
+async def _await(awaitable: Awaitable[T]) -> T:
+    return await awaitable
+
+
+class SyncLicitpy:
+    """
+    Blocking `Licitpy` client for synchronous code (Celery tasks, Django views).
+
+    One event loop runs in a background thread for the lifetime of the
+    client, with a single `Licitpy` opened on it. Every call, from any
+    thread, is submitted to that loop, so the connection pool and the HTTP
+    cache are shared across calls instead of being rebuilt by `asyncio.run`.
+    After a fork (eg: Celery prefork workers) the child starts its own loop
+    and client on first use.
+
+    with SyncLicitpy() as client:
+        tender = client.cl.get_by_code("1057501-353-LE25")
+        tenders = client.cl.get_by_codes(codes, concurrency=20)
+
+    Accepts the same options as `Licitpy`, plus:
+
+    Args:
+        timeout: Default seconds to wait for a call, None to wait forever.
+    """
+
+    def __init__(
+        self,
+        use_cache: bool = True,
+        cache_expire_after: timedelta = timedelta(hours=1),
+        metrics: Metrics | None = None,
+        fixtures: "HttpFixtures | None" = None,
+        connection: ConnectionSettings | None = None,
+        hedging: "HedgePolicy | None" = None,
+        circuit_breaker: "CircuitBreakerPolicy | None" = None,
+        progress: ProgressReporter | None = None,
+        rate_limit: float | None = None,
+        shared_cache: SharedCacheSettings | None = None,
+        timeout: float | None = None,
+    ):
+        self.timeout = timeout
+
+        self._create_client = partial(
+            Licitpy,
+            use_cache=use_cache,
+            cache_expire_after=cache_expire_after,
+            metrics=metrics,
+            fixtures=fixtures,
+            connection=connection,
+            hedging=hedging,
+            circuit_breaker=circuit_breaker,
+            progress=progress,
+            rate_limit=rate_limit,
+            shared_cache=shared_cache,
+        )
+
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._client: Licitpy | None = None
+        self._pid: int | None = None
+
+        self.cl = SyncChileProvider(self)
+        self.eu = SyncEUProvider(self)
+
+    def _get_lock(self) -> threading.Lock:
+        if self._pid is not None and self._pid != os.getpid():
+            # A parent thread may have held the lock when the process forked,
+            # nothing in this process would ever release it.
+            self._lock = threading.Lock()
+            self._pid = None
+
+        return self._lock
+
+    def _start(self) -> tuple[asyncio.AbstractEventLoop, Licitpy]:
+        with self._get_lock():
+            if self._loop is None or self._client is None or self._pid != os.getpid():
+                # A loop inherited through fork has no thread running it,
+                # it is dropped without closing the parent's connections.
+                loop = asyncio.new_event_loop()
+
+                thread = threading.Thread(
+                    target=loop.run_forever, name="licitpy-event-loop", daemon=True
+                )
+                thread.start()
+
+                client = self._create_client()
+                asyncio.run_coroutine_threadsafe(client.__aenter__(), loop).result()
+
+                self._loop = loop
+                self._thread = thread
+                self._client = client
+                self._pid = os.getpid()
+
+            return self._loop, self._client
+
+    @property
+    def client(self) -> Licitpy:
+        """The async client running on the background loop."""
+        return self._start()[1]
+
+    @property
+    def metrics(self) -> Metrics:
+        return self.client.metrics
+
+    def run(self, awaitable: Awaitable[T], timeout: float | None = None) -> T:
+        """
+        Run `awaitable` on the background loop and block until it completes.
+
+        On timeout the call is cancelled and `TimeoutError` is raised.
+        """
+
+        loop, _ = self._start()
+
+        if threading.current_thread() is self._thread:
+            raise RuntimeError(
+                "SyncLicitpy cannot be called from its own event loop, "
+                "await the async client instead."
+            )
+
+        future = asyncio.run_coroutine_threadsafe(_await(awaitable), loop)
+
+        try:
+            return future.result(timeout if timeout is not None else self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    @overload
+    def gather(
+        self,
+        awaitables: Iterable[Awaitable[T]],
+        concurrency: int = ...,
+        return_exceptions: Literal[False] = ...,
+        timeout: float | None = ...,
+    ) -> list[T]: ...
+
+    @overload
+    def gather(
+        self,
+        awaitables: Iterable[Awaitable[T]],
+        concurrency: int = ...,
+        return_exceptions: Literal[True] = ...,
+        timeout: float | None = ...,
+    ) -> list[T | BaseException]: ...
+
+    def gather(
+        self,
+        awaitables: Iterable[Awaitable[T]],
+        concurrency: int = 10,
+        return_exceptions: bool = False,
+        timeout: float | None = None,
+    ) -> list[Any]:
+        """
+        Run a batch with at most `concurrency` awaitables at the same time.
+
+        Results keep the order of `awaitables`. With `return_exceptions`,
+        failures are returned in place of their result instead of raised.
+        """
+
+        if concurrency <= 0:
+            raise ValueError("concurrency must be a positive integer.")
+
+        async def batch() -> list[Any]:
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def bounded(awaitable: Awaitable[T]) -> T:
+                async with semaphore:
+                    return await awaitable
+
+            return await asyncio.gather(
+                *(bounded(awaitable) for awaitable in awaitables),
+                return_exceptions=return_exceptions,
+            )
+
+        return self.run(batch(), timeout)
+
+    def close(self) -> None:
+        """Close the client and stop the background loop."""
+
+        with self._get_lock():
+            loop, thread, client = self._loop, self._thread, self._client
+
+            self._loop = self._thread = self._client = None
+
+            if loop is None or thread is None or self._pid != os.getpid():
+                return
+
+            try:
+                if client is not None:
+                    asyncio.run_coroutine_threadsafe(
+                        client.__aexit__(None, None, None), loop
+                    ).result()
+            finally:
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+                loop.close()
+
+    def __enter__(self) -> "SyncLicitpy":
+        self._start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+class SyncChileProvider:
+    """Blocking counterpart of `MercadoPublicoChileProvider`."""
+
+    def __init__(self, sync: SyncLicitpy) -> None:
+        self._sync = sync
+
+    def get_by_code(self, code: str) -> "Tender":
+        return self._sync.run(self._sync.client.cl.get_by_code(code))
+
+    def get_by_codes(
+        self, codes: Iterable[str], concurrency: int = 10
+    ) -> list["Tender"]:
+        """Fetch several tenders concurrently, in the order of `codes`."""
+
+        provider = self._sync.client.cl
+
+        return self._sync.gather(
+            (provider.get_by_code(code) for code in codes), concurrency
+        )
+
+    def get_attachment_content(self, attachment: "Attachment") -> str | None:
+        """Download an attachment (base64 encoded), the sync `await attachment.content`."""
+        return self._sync.run(attachment.content)
+
+
+class SyncEUProvider:
+    """Blocking counterpart of `EUTenderProvider`."""
+
+    def __init__(self, sync: SyncLicitpy) -> None:
+        self._sync = sync
+        self._parser: "EUTenderParser | None" = None
+
+    def download_monthly_bulk_file(
+        self, when: datetime | str
+    ) -> dict[str, str | int | float]:
+        return self._sync.run(self._sync.client.eu.download_monthly_bulk_file(when))
+
+    def download_yearly_bulk_file(
+        self, year: str
+    ) -> list[dict[str, str | int | float]]:
+        return self._sync.run(self._sync.client.eu.download_yearly_bulk_file(year))
+
+    # Parsing is local and already blocking, it runs without the loop and client
+
+    @property
+    def parser(self) -> "EUTenderParser":
+        if self._parser is None:
+            from licitpy.countries.eu.parser import EUTenderParser
+
+            self._parser = EUTenderParser()
+
+        return self._parser
+
+    def iter_notices(
+        self, path: str | Path, query: "NoticeQuery | None" = None
+    ) -> Iterator["Notice"]:
+        return self.parser.iter_package(path, query)
+
+    def iter_packages(
+        self,
+        paths: Iterable[str | Path],
+        query: "NoticeQuery | None" = None,
+        max_workers: int | None = None,
+        on_error: Callable[[str, Exception], None] | None = None,
+    ) -> Iterator["Notice"]:
+        return self.parser.iter_packages(paths, query, max_workers, on_error)
@@ -0,0 +1,67 @@
+import asyncio
+import gc
+from typing import Any
+
+import pytest
+
+from licitpy.core.concurrency import iter_completed
+
+
+async def _value(value: int) -> int:
+    await asyncio.sleep(0)
+    return value
+
+
+async def _fail(message: str) -> int:
+    await asyncio.sleep(0)
+    raise ValueError(message)
+
+
+def _collect_loop_errors(errors: list[dict[str, Any]]) -> None:
+    asyncio.get_running_loop().set_exception_handler(
+        lambda loop, context: errors.append(context)
+    )
+
+
+def test_iter_completed_yields_the_batch_before_raising() -> None:
+    results: list[int] = []
+    errors: list[dict[str, Any]] = []
+
+    async def main() -> None:
+        _collect_loop_errors(errors)
+
+        awaitables = [_fail("first"), *map(_value, range(20)), _fail("second")]
+
+        with pytest.raises(ValueError, match="first|second"):
+            async for result in iter_completed(awaitables, concurrency=22):
+                results.append(result)
+
+        gc.collect()
+
+    asyncio.run(main())
+
+    assert sorted(results) == list(range(20))
+    assert errors == []
+
+
+def test_iter_completed_retrieves_the_batch_when_closed_early() -> None:
+    errors: list[dict[str, Any]] = []
+
+    async def main() -> None:
+        _collect_loop_errors(errors)
+
+        # Everything finishes in the first batch, the consumer stops after one
+        results = iter_completed(
+            [*map(_value, range(20)), _fail("unseen")], concurrency=21
+        )
+
+        async for _ in results:
+            break
+
+        await results.aclose()
+        del results
+        gc.collect()
+
+    asyncio.run(main())
+
+    assert errors == []
@@ -0,0 +1,42 @@
+import asyncio
+import io
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from licitpy.core.enums import FileType
+from licitpy.core.extraction import TextExtractor
+
+DOCUMENT = (
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    "<w:body><w:p><w:r><w:t>Bases de licitación</w:t></w:r></w:p></w:body>"
+    "</w:document>"
+)
+
+
+def _docx() -> bytes:
+    buffer = io.BytesIO()
+
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", DOCUMENT)
+
+    return buffer.getvalue()
+
+
+def test_cached_text_depends_on_the_file_type(tmp_path: Path) -> None:
+    data = _docx()
+
+    async def main() -> tuple[str, str]:
+        with ThreadPoolExecutor() as executor:
+            extractor = TextExtractor(cache_dir=tmp_path, executor=executor)
+
+            # Wrong type first, its (empty) text must not be served for DOCX
+            as_xlsx = await extractor.extract(data, FileType.XLSX)
+            as_docx = await extractor.extract(data, FileType.DOCX)
+
+        return as_xlsx, as_docx
+
+    as_xlsx, as_docx = asyncio.run(main())
+
+    assert as_xlsx == ""
+    assert as_docx == "Bases de licitación"
@@ -0,0 +1,32 @@
+import asyncio
+
+import pytest
+
+from licitpy.core.pipeline import Pipeline, Stage
+
+
+def test_failing_stage_leaves_no_tasks_behind() -> None:
+    async def fetch(item: int) -> int:
+        await asyncio.sleep(0.01)
+
+        if item == 3:
+            raise ValueError("fetch failed")
+
+        return item
+
+    async def sink(item: int) -> None:
+        await asyncio.sleep(0)
+
+    async def main() -> None:
+        pipeline = Pipeline(
+            [Stage("fetch", fetch, concurrency=4), Stage("sink", sink)],
+            queue_size=2,
+        )
+
+        with pytest.raises(ValueError, match="fetch failed"):
+            await pipeline.run(range(20))
+
+        leftovers = asyncio.all_tasks() - {asyncio.current_task()}
+        assert leftovers == set()
+
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+from licitpy.core.queue import SQLiteWorkQueue, WorkItem
+from licitpy.core.worker import CrawlWorker
+
+
+def test_put_requeues_finished_items(tmp_path: Path) -> None:
+    queue = SQLiteWorkQueue(tmp_path / "queue.sqlite", max_attempts=1)
+
+    async def main() -> None:
+        assert await queue.put("cl.tender", ["a", "b"]) == 2
+
+        # Still pending, nothing to add
+        assert await queue.put("cl.tender", ["a", "b"]) == 0
+
+        first, second = await queue.lease(2, visibility_timeout=60)
+        assert await queue.ack(first)
+        await queue.release(second, error="boom")
+
+        # Leased items are skipped, done and failed ones are queued again
+        assert await queue.put("cl.tender", ["a", "b"]) == 2
+
+        items = await queue.lease(2, visibility_timeout=60)
+        assert sorted(item.payload for item in items) == ["a", "b"]
+        assert all(item.attempts == 1 for item in items)
+
+        assert await queue.put("cl.tender", ["a", "b"]) == 0
+
+    asyncio.run(main())
+
+
+class FlakyQueue(SQLiteWorkQueue):
+    """Fails to extend the first lease, like a database kept busy."""
+
+    extend_failures = 0
+
+    async def extend(self, item: WorkItem, visibility_timeout: float) -> bool:
+        if not self.extend_failures:
+            self.extend_failures += 1
+            raise RuntimeError("database is locked")
+
+        return await super().extend(item, visibility_timeout)
+
+
+def test_worker_abandons_an_item_whose_lease_cannot_be_extended(
+    tmp_path: Path,
+) -> None:
+    queue = FlakyQueue(tmp_path / "queue.sqlite")
+    handled: list[str] = []
+    errors: list[dict[str, Any]] = []
+
+    async def slow_once(payload: str) -> str:
+        handled.append(payload)
+
+        if len(handled) == 1:
+            await asyncio.sleep(10)
+
+        return payload
+
+    async def main() -> None:
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: errors.append(context)
+        )
+
+        await queue.put("test", ["a"])
+
+        worker = CrawlWorker(
+            None,  # type: ignore[arg-type]
+            queue,
+            visibility_timeout=0.2,
+            poll_interval=0.05,
+            retry_delay=0,
+        )
+        worker.register("test", slow_once)
+
+        stats = await asyncio.wait_for(worker.run(), timeout=5)
+
+        assert stats.lost_leases == 1
+        assert stats.processed == 1
+
+    asyncio.run(main())
+
+    # Abandoned on the failed extension, then leased again once it expired
+    assert handled == ["a", "a"]
+    assert errors == []
@@ -0,0 +1,35 @@
+import asyncio
+
+from licitpy.core.resilience import HedgePolicy, Hedger
+
+
+def test_hedger_does_not_time_the_wait_before_an_attempt() -> None:
+    hedger = Hedger(
+        HedgePolicy(percentile=0.95, min_delay=0.05, max_delay=0.05, min_samples=1)
+    )
+    hedges: list[None] = []
+
+    async def throttle() -> None:
+        await asyncio.sleep(0.2)
+
+    async def request() -> str:
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    async def main() -> None:
+        for _ in range(3):
+            result = await hedger.run(
+                "example.org",
+                request,
+                on_hedge=lambda: hedges.append(None),
+                wait=throttle,
+            )
+
+            assert result == "ok"
+
+    asyncio.run(main())
+
+    # Only the request is timed, and the throttle wait never triggers a hedge
+    assert hedger.delay("example.org") == 0.05
+    assert max(hedger._tracker("example.org")._samples) < 0.1
+    assert hedges == []
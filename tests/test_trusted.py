@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+
+from licitpy.core.enums import Attachment, FileType
+from licitpy.core.models import Tender
+from licitpy.countries.eu.models import Notice
+
+ATTACHMENT = {
+    "id": "2",
+    "name": "bases.pdf",
+    "type": "Anexo",
+    "description": None,
+    "size": 1024,
+    "upload_date": "31-01-2024",
+    "file_type": FileType.PDF,
+}
+
+NOTICE = {
+    "notice_id": "123456-2024",
+    "publication_date": "2024-01-31",
+    "country": "ES",
+    "cpv": ["45000000"],
+    "title": "Obras",
+    "notice_format": "eforms",
+    "source": "123456-2024.xml",
+}
+
+
+def test_trusted_attachment_equals_validated() -> None:
+    assert Attachment.from_trusted(**ATTACHMENT) == Attachment(**ATTACHMENT)
+
+
+def test_trusted_notice_equals_validated() -> None:
+    assert Notice.from_trusted(**NOTICE) == Notice(**NOTICE)
+
+
+def test_trusted_tender_equals_validated() -> None:
+    values = {
+        "code": "1057501-353-LE25",
+        "title": "Servicio de aseo",
+        "closing_date": datetime(2025, 1, 31, 15, tzinfo=timezone.utc),
+        "attachment_url": "https://www.mercadopublico.cl/Procurement/Modules/Attachment/ViewAttachment.aspx?enc=abc",
+    }
+
+    trusted = Tender.from_trusted(
+        **values, attachments=[Attachment.from_trusted(**ATTACHMENT)]
+    )
+    validated = Tender(**values, attachments=[Attachment(**ATTACHMENT)])
+
+    assert trusted == validated
+    assert trusted.model_dump() == validated.model_dump()